@@ -16,34 +16,44 @@ __date__ = "2025-03-06"
 __version__ = "1.4.3-pre2"
 
 import argparse
+import concurrent.futures
 import configparser
+import contextlib
 import csv
 import datetime as dt
-import glob
+import email.utils
+import functools
+import hashlib
+import html
+import io
 import json
+import mmap
+import multiprocessing
 import os
 import pathlib
 import platform
+import random
 import re
 import shutil
+import statistics
 import sys
+import threading
 import time
 import traceback
-import urllib.error
-import urllib.request
 import urllib.parse
 import zipfile
 from datetime import datetime
 from pathlib import Path
 
 import requests
-import semver
-import wget
-from bs4 import BeautifulSoup
-from fpdf import FPDF, YPos, XPos
+import requests.adapters
 from rich import print
 from rich.prompt import Prompt
 
+# Mesure du temps de démarrage après les imports (--debug true) : le temps des imports est mesuré par
+# benchmarks/bench_startup.py
+startup_start = time.perf_counter()
+
 
 # Creation of a logfile
 def write_log(info_crash):
@@ -57,9 +67,8 @@ def write_log(info_crash):
             f'{dt.datetime.today().strftime("%Y-%m-%d %H:%M:%S")} : {info_crash}\n')
 
 
-def make_dl_link(mod_file_onlinepath_raw):
-    # Common domain
-    base_domain = "https://moddbcdn.vintagestory.at/"
+def make_dl_link(mod_file_onlinepath_raw, base_domain="https://moddbcdn.vintagestory.at/"):
+    # Common domain (base_domain : [ModDB] cdn_url du config.ini)
     # URL parsing
     parsed_url = urllib.parse.urlparse(mod_file_onlinepath_raw)
     # Extraction of the "path" (after the domain)
@@ -73,152 +82,1474 @@ def make_dl_link(mod_file_onlinepath_raw):
     return mod_file_onlinepath
 
 
+class MappedArchive(mmap.mmap):
+    # Fichier mappé en mémoire utilisable par zipfile (lecture seule)
+    @staticmethod
+    def seekable():
+        return True
+
+    def seek(self, pos, whence=0):
+        try:
+            return super().seek(pos, whence)
+        except ValueError as err:
+            # Comme pour un fichier classique (zipfile attend une OSError)
+            raise OSError(str(err))
+
+
+class ModInfoParser:
+    # Lecture tolérante de modinfo.json (dialecte proche de JSON5) en un seul passage :
+    # clés sans guillemets, guillemets simples, virgules finales ou manquantes, commentaires // et /* */
+    re_blank = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.DOTALL)
+    re_identifier = re.compile(r'[^\s:,{}\[\]"\'/]+')
+    re_string_chunk = {'"': re.compile(r'[^"\\]*'), "'": re.compile(r"[^'\\]*")}
+    escapes = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '\n': ''}
+    keywords = {'true': True, 'false': False, 'null': None}
+
+    def __init__(self, text):
+        self.text = text.lstrip('\ufeff')
+        self.pos = 0
+
+    def error(self, msg):
+        raise ValueError(f'{msg} (position {self.pos})')
+
+    def skip(self):
+        self.pos = self.re_blank.match(self.text, self.pos).end()
+
+    def parse(self):
+        self.skip()
+        if self.text[self.pos:self.pos + 1] != '{':
+            self.error("'{' expected")
+        # Casse des clés quelconque (ModID, modid, Name...) : clés de premier niveau en minuscules
+        return {key.lower(): value for key, value in self.object().items()}
+
+    def value(self):
+        char = self.text[self.pos:self.pos + 1]
+        if char == '{':
+            return self.object()
+        if char == '[':
+            return self.array()
+        if char == '"' or char == "'":
+            return self.string(char)
+        token = self.identifier()
+        if token in self.keywords:
+            return self.keywords[token]
+        try:
+            return int(token)
+        except ValueError:
+            pass
+        try:
+            return float(token)
+        except ValueError:
+            return token  # valeur sans guillemets
+
+    def object(self):
+        self.pos += 1
+        result = {}
+        while True:
+            self.skip()
+            char = self.text[self.pos:self.pos + 1]
+            if char == '}':
+                self.pos += 1
+                return result
+            if char == '':
+                self.error("'}' expected")
+            key = self.string(char) if char == '"' or char == "'" else self.identifier()
+            self.skip()
+            if self.text[self.pos:self.pos + 1] != ':':
+                self.error("':' expected")
+            self.pos += 1
+            self.skip()
+            result[key] = self.value()
+            self.skip()
+            if self.text[self.pos:self.pos + 1] == ',':
+                self.pos += 1
+
+    def array(self):
+        self.pos += 1
+        result = []
+        while True:
+            self.skip()
+            char = self.text[self.pos:self.pos + 1]
+            if char == ']':
+                self.pos += 1
+                return result
+            if char == '':
+                self.error("']' expected")
+            result.append(self.value())
+            self.skip()
+            if self.text[self.pos:self.pos + 1] == ',':
+                self.pos += 1
+
+    def identifier(self):
+        match = self.re_identifier.match(self.text, self.pos)
+        if match is None:
+            self.error('unexpected character')
+        self.pos = match.end()
+        return match.group()
+
+    def string(self, quote):
+        self.pos += 1
+        text = self.text
+        chunk = self.re_string_chunk[quote]
+        parts = []
+        while True:
+            match = chunk.match(text, self.pos)
+            parts.append(match.group())
+            self.pos = match.end()
+            char = text[self.pos:self.pos + 1]
+            if char == quote:
+                self.pos += 1
+                return ''.join(parts)
+            if char == '':
+                self.error('unterminated string')
+            # Séquence d'échappement
+            escape = text[self.pos + 1:self.pos + 2]
+            if escape == 'u':
+                try:
+                    code = int(text[self.pos + 2:self.pos + 6], 16)
+                except ValueError:
+                    self.error('invalid \\u escape')
+                self.pos += 6
+                # Paire de substitution (caractères hors BMP)
+                if 0xD800 <= code < 0xDC00 and text[self.pos:self.pos + 2] == '\\u':
+                    try:
+                        low = int(text[self.pos + 2:self.pos + 6], 16)
+                    except ValueError:
+                        low = 0
+                    if 0xDC00 <= low < 0xE000:
+                        code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                        self.pos += 6
+                parts.append(chr(code))
+            else:
+                parts.append(self.escapes.get(escape, escape))
+                self.pos += 2
+
+
+def parse_modinfo(text):
+    """Retourne le contenu de modinfo.json (clés de premier niveau en minuscules). ValueError si illisible."""
+    try:
+        # Cas le plus courant : JSON standard, lu par le décodeur json (plus rapide)
+        modinfo_data = json.loads(text)
+    except ValueError:
+        return ModInfoParser(text).parse()
+    if not isinstance(modinfo_data, dict):
+        raise ValueError('modinfo.json is not a JSON object')
+    return {key.lower(): value for key, value in modinfo_data.items()}
+
+
+@functools.lru_cache(maxsize=8192)
+def version_key(version):
+    """Clé comparable d'une version de mod ou du jeu ('1.2.3', 'v1.19', '1.0.0-rc.2', '2.0.0beta3', '1.2.3.4'...).
+
+    (parties numériques sans les zéros finaux, 1 pour une version stable / 0 pour une pré-version, identifiants
+    de la pré-version). None si la version ne commence pas par un nombre.
+    """
+    match = re.match(r'\s*[vV]?(\d+(?:\.\d+)*)(.*)', str(version))
+    if match is None:
+        return None
+    numbers = [int(part) for part in match[1].split('.')]
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()
+    # Métadonnées de build (+...) ignorées, comme pour semver
+    prerelease = match[2].split('+', 1)[0]
+    identifiers = tuple((0, int(part), '') if part.isdigit() else (1, 0, part.lower())
+                        for part in re.findall(r'\d+|[A-Za-z]+', prerelease))
+    if not identifiers:
+        return tuple(numbers), 1, ()
+    return tuple(numbers), 0, identifiers
+
+
+def compare_versions(version1, version2):
+    """-1, 0 ou 1 comme semver.compare, None si une des versions est illisible."""
+    key1 = version_key(version1)
+    key2 = version_key(version2)
+    if key1 is None or key2 is None:
+        return None
+    return (key1 > key2) - (key1 < key2)
+
+
+def scan_mod_archive(filepath, check_level=None, read_modinfo=True, read_icon=False):
+    # Lecture d'une archive de mod en une seule ouverture (fichier mappé en mémoire) :
+    # contrôle de l'archive (check_level : 'full', 'fast' ou None), présence et contenu de modinfo.json et modicon.png
+    record = {'path': str(filepath), 'error': None, 'has_modinfo': False, 'modinfo': None,
+              'modinfo_data': None, 'icon': None}
+    try:
+        with open(filepath, 'rb') as archive_file:
+            file_size = os.fstat(archive_file.fileno()).st_size
+            if file_size == 0:
+                raise zipfile.BadZipFile
+            with MappedArchive(archive_file.fileno(), 0, access=mmap.ACCESS_READ) as archive_map:
+                with zipfile.ZipFile(archive_map) as zip_file:
+                    if check_level == 'full':
+                        corrupted_file = zip_file.testzip()
+                    elif check_level == 'fast':
+                        corrupted_file = ZipValidationCache.check_central_directory(zip_file,
+                                                                                    file_size)
+                    else:
+                        corrupted_file = None
+                    if corrupted_file is not None:
+                        record['error'] = f"The ZIP file {filepath} is corrupted: {corrupted_file}"
+                        return record
+                    names = set(zip_file.namelist())
+                    record['has_modinfo'] = 'modinfo.json' in names
+                    if read_modinfo and record['has_modinfo']:
+                        record['modinfo'] = zip_file.read('modinfo.json').decode('utf-8-sig')
+                        # Lu ici pour profiter des processus de l'analyse parallèle (l'erreur éventuelle est
+                        # signalée par extract_modinfo)
+                        try:
+                            record['modinfo_data'] = parse_modinfo(record['modinfo'])
+                        except ValueError:
+                            pass
+                    if read_icon and 'modicon.png' in names:
+                        record['icon'] = zip_file.read('modicon.png')
+    except zipfile.BadZipFile:
+        record['error'] = f"The file {filepath} is not a valid ZIP file."
+    except Exception as e:
+        record['error'] = f"Error occurred while processing {filepath}: {e}"
+    return record
+
+
 class LanguageChoice:
-    def __init__(self):
-        self.url_mods = 'https://mods.vintagestory.at/'
-        self.path_lang = Path("lang")
-        # Si on définit manuellement la langue via le fichier config
-        self.config_file = Path('config.ini')
-        self.config_read = configparser.ConfigParser(allow_no_value=True,
-                                                     interpolation=None)
-        self.config_read.read(self.config_file, encoding='utf-8-sig')
-        # On vérifie si args.language existe
+    # Contexte partagé par tout le script : config.ini et fichier de langue lus une seule fois (au premier accès).
+    # Les textes sont servis depuis un catalogue en mémoire, en_US.json complète les clés absentes d'une traduction.
+    # Adresses de moddb par défaut (modifiables dans la section [ModDB] du config.ini, ex : serveur de test)
+    default_url_mods = 'https://mods.vintagestory.at/'
+    default_url_cdn = 'https://moddbcdn.vintagestory.at/'
+    path_lang = Path("lang")
+    default_lang = 'en_US'
+    # Nom de l'attribut -> clé du fichier de langue (quand ils sont différents)
+    key_alias = {'language_comment': 'language', 'makepdf': 'makePDF'}
+    # Dico pour les langues - Region, langue-abr, langue, index
+    dic_lang = {
+        "DE": ["de", "Deutsch", '1'],
+        "US": ["en", "English", '2'],
+        "ES": ["es", "Español", '3'],
+        "FR": ["fr", "Français", '4'],
+        "IT": ["it", "Italiano", '5'],
+        "BR": ["pt", "Português", '6'],
+        "RU": ["ru", "Русский", '7'],
+        "UA": ["uk", "Українська", '8']
+    }
+
+    def __init__(self, config_file=Path('config.ini')):
+        self.config_file = Path(config_file)
+        self._config_read = None
+        self._catalog = None
+
+    def reload(self):
+        # A appeler après l'écriture de config.ini (premier lancement)
+        self._config_read = None
+        self._catalog = None
+
+    @property
+    def config_read(self):
+        if self._config_read is None:
+            config_read = configparser.ConfigParser(allow_no_value=True, interpolation=None)
+            config_read.read(self.config_file, encoding='utf-8-sig')
+            self._config_read = config_read
+        return self._config_read
+
+    @property
+    def url_mods(self):
+        return f"{(self.config_read.get('ModDB', 'url', fallback=None) or self.default_url_mods).rstrip('/')}/"
+
+    @property
+    def url_cdn(self):
+        return f"{(self.config_read.get('ModDB', 'cdn_url', fallback=None) or self.default_url_cdn).rstrip('/')}/"
+
+    @property
+    def lang(self):
+        # --language, sinon la langue de config.ini, sinon l'anglais
         if args.language:
-            self.lang = f'{args.language}.json'
-        # Sinon on récupère la langue via config.ini
-        else:
-            try:
-                self.config_lang = self.config_read.get('Language', 'language')
-                self.lang = f'{self.config_lang}.json'
-            # On charge le fichier en_US.json
-            except (configparser.NoOptionError, configparser.NoSectionError):
-                self.lang = 'en_US.json'
-        self.file_lang_path = Path(self.path_lang, self.lang)
-        if not self.file_lang_path.is_file():
-            self.file_lang_path = Path(self.path_lang,
-                                       'en_US.json')  # on charge en.json si aucun fichier de langue n'est présent
-        # On charge le fichier de langue
-        with open(self.file_lang_path, "r", encoding='utf-8-sig') as lang_json:
-            desc = json.load(lang_json)
-            self.setconfig = desc['setconfig']
-            self.setconfig01 = desc['setconfig01']
-            self.datapath = desc['datapath']
-            self.title = desc['title']
-            self.title2 = desc['title2']
-            self.version_max = desc['version_max']
-            self.author = desc['author']
-            self.first_launch_title = desc['first_launch_title']
-            self.first_launch_lang_choice = desc['first_launch_lang_choice']
-            self.first_launch_config_done = desc['first_launch_config_done']
-            self.first_launch_pathmods = desc['first_launch_pathmods']
-            self.first_launch_lang_txt = desc['first_launch_lang_txt']
-            self.first_launch_game_ver_max = desc['first_launch_game_ver_max']
-            self.first_launch2 = desc['first_launch2']
-            self.first_launch3 = desc['first_launch3']
-            self.err_list = desc['err_list']
-            self.compver1 = desc['compver1']
-            self.compver2 = desc['compver2']
-            self.compver3 = desc['compver3']
-            self.compver3a = desc['compver3a']
-            self.compver4 = desc['compver4']
-            self.summary1 = desc['summary1']
-            self.summary2 = desc['summary2']
-            self.summary3 = desc['summary3']
-            self.summary4 = desc['summary4']
-            self.summary5 = desc['summary5']
-            self.summary6 = desc['summary6']
-            self.summary7 = desc['summary7']
-            self.error_modid = desc['error_modid']
-            self.error = desc['error']
-            self.last_update = desc['last_update']
-            self.yes = desc['yes']
-            self.no = desc['no']
-            self.existing_update = desc['existing_update']
-            self.exiting_script = desc['exiting_script']
-            self.language_comment = desc['language']
-            self.makePDFTitle = desc['makePDFTitle']
-            self.makepdf = desc['makePDF']
-            self.addingmodsinprogress = desc['addingmodsinprogress']
-            self.makingpdfended = desc['makingpdfended']
-            self.pdfTitle = desc['pdfTitle']
-            self.ErrorCreationPDF = desc['ErrorCreationPDF']
-            self.end_of_prg = desc['end_of_prg']
-            self.error_msg = desc['error_msg']
-
+            return args.language
+        return self.config_read.get('Language', 'language', fallback=None) or self.default_lang
+
+    @property
+    def file_lang_path(self):
+        file_lang_path = Path(self.path_lang, f'{self.lang}.json')
+        if not file_lang_path.is_file():
+            file_lang_path = Path(self.path_lang, f'{self.default_lang}.json')  # en_US.json si la langue n'existe pas
+        return file_lang_path
+
+    @property
+    def catalog(self):
+        if self._catalog is None:
+            default_path = Path(self.path_lang, f'{self.default_lang}.json')
+            with open(default_path, "r", encoding='utf-8-sig') as lang_json:
+                catalog = json.load(lang_json)
+            file_lang_path = self.file_lang_path
+            if file_lang_path != default_path:
+                try:
+                    with open(file_lang_path, "r", encoding='utf-8-sig') as lang_json:
+                        catalog.update(json.load(lang_json))
+                except (OSError, ValueError):
+                    write_log(traceback.format_exc())
+            self._catalog = catalog
+        return self._catalog
+
+    @property
+    def list_yesno(self):
         # On crée une liste pour les réponses O/N
-        self.list_yesno = [self.yes.lower(), self.no.lower(), self.yes[0].lower(),
-                           self.no[0].lower()]
-        # Dico pour les langues - Region, langue-abr, langue, index
-        self.dic_lang = {
-            "DE": ["de", "Deutsch", '1'],
-            "US": ["en", "English", '2'],
-            "ES": ["es", "Español", '3'],
-            "FR": ["fr", "Français", '4'],
-            "IT": ["it", "Italiano", '5'],
-            "BR": ["pt", "Português", '6'],
-            "RU": ["ru", "Русский", '7'],
-            "UA": ["uk", "Українська", '8']
-        }
+        return [self.yes.lower(), self.no.lower(), self.yes[0].lower(), self.no[0].lower()]
+
+    def __getattr__(self, name):
+        # Textes du fichier de langue (ex : lang.summary1)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self.catalog[self.key_alias.get(name, name)]
+        except KeyError:
+            raise AttributeError(name) from None
 
 
 class MajScript:
+    # Vérification d'une nouvelle version du script, lancée en arrière-plan dès le démarrage :
+    # le résultat est affiché à l'accueil s'il est déjà connu, sinon à la fin de l'exécution.
+    # La version en ligne est gardée dans le cache de l'API (pas de requête pendant le ttl).
     def __init__(self):
         # Version du script pour affichage titre.
         super().__init__()
         # system
         self.my_os = platform.system()
+        self.thread = None
+        self.update_link = None
+        self.shown = False
 
-    def check_update_script(self):
-        # Scrap pour recuperer la derniere version en ligne du script
+    def url_script(self):
         if self.my_os == "Windows":
-            url_script = 'https://mods.vintagestory.at/modsupdater#tab-files'
+            return f'{lang.url_mods}modsupdater#tab-files'
         elif self.my_os == 'Linux':
-            url_script = 'https://mods.vintagestory.at/modsupdaterforlinux#tab-files'
-        else:
-            url_script = ''
-        req_url_script = urllib.request.Request(url_script)
+            return f'{lang.url_mods}modsupdaterforlinux#tab-files'
+        return ''
+
+    def online_version(self, url_script):
+        # Dernière version en ligne et lien de téléchargement (cache, sinon scrap de la page)
+        entry = api_cache.read(url_script)
+        if entry is not None and time.time() - entry['fetched'] < api_cache.ttl:
+            return entry['body']
+        # BeautifulSoup n'est chargé que si la page doit être lue
+        from bs4 import BeautifulSoup
+        req_page_url = http_client.get(url_script, timeout=2, retries=0)
+        req_page_url.raise_for_status()
+        page = req_page_url.content
+        soup = BeautifulSoup(page, features="html.parser")
+        soup_changelog = soup.find("div", {"class": "changelogtext"})
+        soup_link_prg = soup.find("a", {"class": "downloadbutton"})
+        # on recupere la version du chanlog
+        regexp_online_ver_modsupdater = '<strong>v(.*)</strong>'
+        online_ver_modsupdater = re.search(regexp_online_ver_modsupdater,
+                                           str(soup_changelog))
+        online = {'version': online_ver_modsupdater[1], 'href': soup_link_prg["href"]}
+        api_cache.write({'url': url_script, 'fetched': time.time(), 'etag': None,
+                         'last_modified': None, 'body': online})
+        return online
+
+    def check_update_script(self):
+        url_script = self.url_script()
         try:
-            urllib.request.urlopen(req_url_script)
-            req_page_url = requests.get(url_script, timeout=2)
-            page = req_page_url.content
-            soup = BeautifulSoup(page, features="html.parser")
-            soup_changelog = soup.find("div", {"class": "changelogtext"})
-            soup_link_prg = soup.find("a", {"class": "downloadbutton"})
-            # on recupere la version du chanlog
-            regexp_online_ver_modsupdater = '<strong>v(.*)</strong>'
-            online_ver_modsupdater = re.search(regexp_online_ver_modsupdater,
-                                               str(soup_changelog))
+            online = self.online_version(url_script)
             # On compare les versions
-            result = VSUpdate.compversion_local(__version__, online_ver_modsupdater[1])
+            result = VSUpdate.compversion_local(__version__, online['version'])
             if result == -1:
-                column, row = os.get_terminal_size()
-                maj_txt = f'[red]{LanguageChoice().existing_update}[/red]{LanguageChoice().url_mods.rstrip("/")}{soup_link_prg["href"]}'
-                lines_update = maj_txt.splitlines()
-                for line in lines_update:
-                    print(f'{line.center(column)}')
+                self.update_link = f'{lang.url_mods.rstrip("/")}{online["href"]}'
         except requests.exceptions.ReadTimeout:
             write_log(
                 'ReadTimeout error: Server did not respond within the specified timeout.')
-        except urllib.error.URLError as err_url:
+        except CircuitOpenError:
+            pass  # serveur injoignable : déjà écrit dans le log par le disjoncteur
+        except requests.exceptions.RequestException as err_url:
             # Affiche de l'erreur si le lien n'est pas valide
             # print(f'[red]{LanguageChoice().error_msg}[/red]')  # debug
-            msg_error = f'{err_url.reason} : {url_script}'
+            msg_error = f'{err_url} : {url_script}'
             write_log(msg_error)
+        except (TypeError, KeyError):
+            # Page sans version ou sans lien de téléchargement
+            write_log(traceback.format_exc())
+
+    def start(self):
+        self.thread = threading.Thread(target=self.check_update_script, daemon=True)
+        self.thread.start()
+
+    def show(self, wait=True):
+        # Affiche le lien de la nouvelle version (une seule fois)
+        if self.shown or self.thread is None:
+            return
+        if wait:
+            self.thread.join()
+        elif self.thread.is_alive():
+            return
+        self.shown = True
+        if self.update_link is not None:
+            column, row = shutil.get_terminal_size()
+            maj_txt = f'[red]{lang.existing_update}[/red]{self.update_link}'
+            lines_update = maj_txt.splitlines()
+            for line in lines_update:
+                print(f'{line.center(column)}')
+
+
+class TokenBucket:
+    # Limite du nombre de requêtes par seconde vers un hôte (seau de jetons partagé par tous les threads).
+    # pause() bloque toutes les requêtes vers l'hôte (Retry-After d'une réponse 429/503) et divise le débit par 2,
+    # qui remonte ensuite peu à peu jusqu'au maximum à chaque réponse réussie.
+    min_rate = 0.5
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate  # jetons par seconde (0 = pas de limite)
+        self.max_rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                wait = self.paused_until - now
+                if wait <= 0:
+                    if self.rate <= 0:
+                        return
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, delay):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            if self.rate > 0:
+                self.rate = max(self.min_rate, self.rate / 2)
+
+    def success(self):
+        with self.lock:
+            if 0 < self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + 0.1)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    # Requête refusée sans être envoyée : l'hôte ne répond plus (disjoncteur ouvert)
+    pass
+
+
+class CircuitBreaker:
+    # Disjoncteur d'un hôte : ouvert après plusieurs échecs consécutifs (erreur réseau, timeout, erreur 5xx),
+    # les requêtes suivantes échouent alors immédiatement au lieu d'attendre chacune leur timeout.
+    # Un thread sonde l'hôte en arrière-plan et referme le disjoncteur dès qu'il répond.
+    threshold = 3
+    probe_interval = 5
+    max_probe_interval = 60
+
+    def __init__(self, host, probe):
+        self.host = host
+        self.probe = probe  # fonction qui renvoie True si l'hôte répond
+        self.failures = 0
+        self.is_open = False
+        self.opened = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        return not self.is_open
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.is_open or self.failures < self.threshold:
+                return
+            self.is_open = True
+            self.opened = time.time()
+        write_log(f'{self.host} is not responding ({self.threshold} failures in a row) : '
+                  f'requests suspended until it responds again.')
+        threading.Thread(target=self.reprobe, daemon=True).start()
+
+    def reprobe(self):
+        interval = self.probe_interval
+        while True:
+            time.sleep(interval)
+            if self.probe():
+                with self.lock:
+                    self.is_open = False
+                    self.failures = 0
+                write_log(f'{self.host} is responding again after {int(time.time() - self.opened)} s.')
+                return
+            interval = min(self.max_probe_interval, interval * 2)
+
+
+class HttpClient:
+    # Client http partagé par tout le script :
+    # - une session keep-alive (pool de connexions) par hôte (api/site, cdn)
+    # - les requêtes identiques en cours ne partent qu'une fois, les autres threads attendent la même réponse
+    # - nombre de requêtes par seconde limité par hôte (rate_limit), nouvel essai après une erreur réseau
+    #   ou une réponse 429/503 (Retry-After, sinon attente exponentielle avec une part aléatoire)
+    # - délai d'attente (timeout) adapté à la latence observée de chaque hôte
+    # - disjoncteur par hôte : plus de requête vers un hôte qui ne répond plus, jusqu'à ce qu'il réponde à nouveau
+    # - compteurs de requêtes, octets et temps par hôte
+    # Réponses pour lesquelles un nouvel essai est fait
+    retry_status = (429, 503)
+    max_timeout = 60
+    max_backoff = 30
+
+    def __init__(self, pool_size=10, rate_limit=0, retries=3):
+        self.pool_size = pool_size
+        self.rate_limit = rate_limit
+        self.retries = retries
+        self.sessions = {}
+        self.buckets = {}
+        self.breakers = {}
+        # Latence lissée et variation par hôte (comme le rtt de TCP)
+        self.latency = {}
+        self.in_flight = {}
+        self.stats = {}
+        # Journal de chaque requête (url, statut, durée, octets), seulement avec --profile
+        self.request_log = None
+        self.lock = threading.Lock()
+
+    def set_pool_size(self, pool_size):
+        # A appeler avant les premières requêtes
+        with self.lock:
+            self.pool_size = max(self.pool_size, pool_size)
+
+    def session(self, host):
+        with self.lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                        pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers['User-Agent'] = f'VS_ModsUpdater/{__version__}'
+                self.sessions[host] = session
+            return self.sessions[host]
+
+    def bucket(self, host):
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate_limit)
+            return self.buckets[host]
+
+    def breaker(self, host, url):
+        with self.lock:
+            if host not in self.breakers:
+                parsed_url = urllib.parse.urlparse(url)
+                probe_url = f'{parsed_url.scheme}://{host}/'
+                self.breakers[host] = CircuitBreaker(host, functools.partial(self.probe, host, probe_url))
+            return self.breakers[host]
+
+    def probe(self, host, probe_url):
+        # Sonde d'un hôte dont le disjoncteur est ouvert (sans limite de débit ni nouvel essai)
+        try:
+            response = self.session(host).get(probe_url, timeout=5)
+            response.close()
+            return response.status_code < 500
+        except requests.exceptions.RequestException:
+            return False
+
+    def unreachable_hosts(self):
+        with self.lock:
+            return [host for host, breaker in self.breakers.items() if breaker.is_open]
+
+    def add_stats(self, host, nb_bytes=0, elapsed=0.0, nb_requests=0, nb_retries=0):
+        with self.lock:
+            host_stats = self.stats.setdefault(host, {'requests': 0, 'bytes': 0, 'time': 0.0, 'retries': 0})
+            host_stats['requests'] += nb_requests
+            host_stats['bytes'] += nb_bytes
+            host_stats['time'] += elapsed
+            host_stats['retries'] += nb_retries
+
+    def add_latency(self, host, elapsed):
+        with self.lock:
+            if host not in self.latency:
+                self.latency[host] = (elapsed, elapsed / 2)
+            else:
+                srtt, rttvar = self.latency[host]
+                rttvar = 0.75 * rttvar + 0.25 * abs(srtt - elapsed)
+                srtt = 0.875 * srtt + 0.125 * elapsed
+                self.latency[host] = (srtt, rttvar)
+
+    def timeout_for(self, host, timeout, attempt):
+        # Jamais moins que le timeout demandé, plus long si l'hôte est lent, doublé à chaque nouvel essai
+        with self.lock:
+            latency = self.latency.get(host)
+        if latency is not None:
+            timeout = max(timeout, 2 * (latency[0] + 4 * latency[1]))
+        return min(self.max_timeout, timeout * 2 ** attempt)
+
+    def backoff(self, attempt):
+        # Attente exponentielle avec une part aléatoire (les threads ne réessaient pas tous en même temps)
+        return random.uniform(0, min(self.max_backoff, 0.5 * 2 ** attempt))
+
+    def retry_wait(self, host, attempt, response=None):
+        # Avant un nouvel essai : serveur surchargé (429/503), toutes les requêtes vers l'hôte attendent le délai
+        # demandé (Retry-After) ; sinon attente exponentielle de ce seul thread
+        if response is None:
+            time.sleep(self.backoff(attempt))
+            return
+        delay = self.retry_after(response)
+        self.bucket(host).pause(min(self.max_backoff, delay) if delay is not None else self.backoff(attempt))
+
+    @staticmethod
+    def retry_after(response):
+        # En-tête Retry-After : nombre de secondes ou date http
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            retry_date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_date.timestamp() - time.time())
+
+    def log_request(self, url, status, elapsed, nb_bytes):
+        if self.request_log is not None:
+            with self.lock:
+                self.request_log.append({'url': url, 'host': urllib.parse.urlparse(url).netloc,
+                                         'status': status, 'time': round(elapsed, 4), 'bytes': nb_bytes})
+
+    def request(self, url, headers=None, timeout=5, stream=False, allow_redirects=True, retries=None,
+                count_failure=True):
+        # Un seul échec compté par le disjoncteur pour la requête, une fois tous les essais faits
+        # (count_failure=False : l'appelant compte lui-même, cf. download)
+        host = urllib.parse.urlparse(url).netloc
+        bucket = self.bucket(host)
+        breaker = self.breaker(host, url)
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f'{host} is not responding : {url}')
+            bucket.acquire()
+            start = time.perf_counter()
+            status = None
+            try:
+                response = self.session(host).get(url, headers=headers,
+                                                  timeout=self.timeout_for(host, timeout, attempt),
+                                                  stream=stream,
+                                                  allow_redirects=allow_redirects)
+                status = response.status_code
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == retries:
+                    if count_failure:
+                        breaker.failure()
+                    raise
+                self.retry_wait(host, attempt)
+                continue
+            finally:
+                elapsed = time.perf_counter() - start
+                self.add_stats(host, elapsed=elapsed, nb_requests=1, nb_retries=1 if attempt else 0)
+                if status is None:
+                    # Requête en échec (timeout, connexion...)
+                    self.log_request(url, status, elapsed, 0)
+            if status in self.retry_status and attempt < retries:
+                self.retry_wait(host, attempt, response)
+                self.log_request(url, status, elapsed, 0)
+                response.close()
+                continue
+            if status < 500:
+                breaker.success()
+                self.add_latency(host, elapsed)
+                bucket.success()
+            elif count_failure:
+                breaker.failure()
+            # En stream, les octets sont comptés par l'appelant (add_stats)
+            nb_bytes = 0 if stream else len(response.content)
+            self.add_stats(host, nb_bytes=nb_bytes)
+            if not stream:
+                self.log_request(url, status, elapsed, nb_bytes)
+            return response
+
+    def get(self, url, headers=None, timeout=5, stream=False, allow_redirects=True, retries=None):
+        if stream:
+            return self.request(url, headers, timeout, stream, allow_redirects, retries)
+        key = (url, tuple(sorted((headers or {}).items())), allow_redirects)
+        with self.lock:
+            future = self.in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self.in_flight[key] = future
+        if not owner:
+            # Même requête déjà en cours dans un autre thread
+            return future.result()
+        try:
+            response = self.request(url, headers, timeout, stream, allow_redirects, retries)
+            future.set_result(response)
+            return response
+        except Exception as err:
+            future.set_exception(err)
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+
+    def download(self, url, dest_path, on_size=None, chunk_size=64 * 1024):
+        # Téléchargement en streaming dans un fichier .part (mémoire bornée), repris avec un en-tête Range
+        # si le transfert est interrompu. Le fichier de destination n'est remplacé qu'une fois le fichier complet.
+        # Seule boucle de nouveaux essais pour un téléchargement (max_retries) : chaque requête est envoyée une fois.
+        dest_path = Path(dest_path)
+        part_path = dest_path.with_name(f'{dest_path.name}.part')
+        host = urllib.parse.urlparse(url).netloc
+        total_size = None
+        for attempt in range(self.retries + 1):
+            offset = part_path.stat().st_size if part_path.is_file() else 0
+            headers = {'Range': f'bytes={offset}-'} if offset else None
+            start = time.perf_counter()
+            nb_bytes = 0
+            try:
+                with self.request(url, headers=headers, timeout=min(self.max_timeout, 5 * 2 ** attempt),
+                                  stream=True, retries=0, count_failure=False) as response:
+                    if response.status_code == 416:
+                        # Fichier .part invalide : on recommence depuis le début
+                        part_path.unlink()
+                        continue
+                    if response.status_code in self.retry_status and attempt < self.retries:
+                        self.retry_wait(host, attempt, response)
+                        continue
+                    if response.status_code >= 500:
+                        self.breaker(host, url).failure()
+                    response.raise_for_status()
+                    if response.status_code == 206:
+                        mode = 'ab'
+                        content_range = response.headers.get('Content-Range', '')
+                        if content_range.rpartition('/')[2].isdigit():
+                            total_size = int(content_range.rpartition('/')[2])
+                    else:
+                        mode = 'wb'
+                        content_length = response.headers.get('Content-Length')
+                        if content_length is not None and not response.headers.get('Content-Encoding'):
+                            total_size = int(content_length)
+                    if on_size is not None:
+                        on_size(total_size)
+                        on_size = None
+                    with open(part_path, mode) as part_file:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            part_file.write(chunk)
+                            self.add_stats(host, nb_bytes=len(chunk))
+                            nb_bytes += len(chunk)
+                    self.log_request(url, response.status_code, time.perf_counter() - start, nb_bytes)
+            except CircuitOpenError:
+                raise
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout):
+                if attempt == self.retries:
+                    self.breaker(host, url).failure()
+                    raise
+                self.retry_wait(host, attempt)
+                continue
+            if total_size is None or part_path.stat().st_size == total_size:
+                break
+        size = part_path.stat().st_size if part_path.is_file() else 0
+        if total_size is not None and size != total_size:
+            raise OSError(f'Incomplete download ({size}/{total_size} bytes) : {url}')
+        os.replace(part_path, dest_path)
+        return dest_path
+
+
+class RunProfiler:
+    # Mesures de l'exécution (--profile) : durée de chaque phase, latence et octets de chaque requête,
+    # rapport json dans le dossier logs (et fichier pstats de cProfile avec --profile pstats).
+    def __init__(self, mode='false'):
+        self.enabled = mode in ('true', 'pstats')
+        self.phases = []
+        self.start_time = time.perf_counter()
+        self.started = dt.datetime.now()
+        self.profile = None
+        if self.enabled:
+            http_client.request_log = []
+        if mode == 'pstats':
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    @contextlib.contextmanager
+    def phase(self, name, folder=None):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({'phase': name, 'folder': str(folder) if folder is not None else None,
+                                'time': round(time.perf_counter() - start, 4)})
+
+    @staticmethod
+    def latency(times):
+        # Latences d'un hôte (en secondes)
+        times = sorted(times)
+        return {'min': round(times[0], 4), 'median': round(statistics.median(times), 4),
+                'p95': round(times[min(len(times) - 1, int(len(times) * 0.95))], 4), 'max': round(times[-1], 4)}
+
+    def report(self):
+        if not self.enabled:
+            return None
+        if self.profile is not None:
+            self.profile.disable()
+        request_log = list(http_client.request_log)
+        hosts = {}
+        for host, host_stats in http_client.stats.items():
+            times = [request['time'] for request in request_log if request['host'] == host]
+            hosts[host] = {'requests': host_stats['requests'], 'bytes': host_stats['bytes'],
+                           'time': round(host_stats['time'], 4), 'retries': host_stats['retries'],
+                           'latency': self.latency(times) if times else None}
+        report = {
+            'version': __version__,
+            'started': self.started.isoformat(timespec='seconds'),
+            'args': {key: str(value) if value is not None else None for key, value in vars(args).items()},
+            'startup_time': round(self.start_time - startup_start, 4),
+            'total_time': round(time.perf_counter() - startup_start, 4),
+            'phases': self.phases,
+            'hosts': hosts,
+            'requests': request_log
+        }
+        os.makedirs('logs', exist_ok=True)
+        report_name = f'profile-{self.started.strftime("%Y%m%d%H%M%S")}'
+        report_path = Path('logs', f'{report_name}.json')
+        try:
+            with open(report_path, 'w', encoding='utf-8') as report_json:
+                json.dump(report, report_json, indent=2, ensure_ascii=False)
+            print(f'\n[bold]Profile : {report_path}[/bold]')
+            if self.profile is not None:
+                pstats_path = Path('logs', f'{report_name}.pstats')
+                self.profile.dump_stats(pstats_path)
+                print(f'[bold]Profile (pstats) : {pstats_path}[/bold]')
+        except OSError:
+            write_log(traceback.format_exc())
+            return None
+        return report_path
+
+
+class ApiCache:
+    # Cache disque des réponses de l'API de moddb (un fichier json par url).
+    # Une réponse plus récente que le ttl est utilisée telle quelle, sinon elle est revalidée
+    # par une requête conditionnelle (ETag / Last-Modified) quand le serveur le permet.
+    def __init__(self, cache_dir, ttl):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl  # en secondes
+        self.lock = threading.Lock()
+        # Réponses déjà obtenues ou revalidées pendant l'exécution : pas de seconde requête
+        self.checked = {}
+        # Réponses anciennes utilisées faute de réponse du serveur : url -> date de la réponse
+        self.stale = {}
+
+    def entry_path(self, url):
+        return Path(self.cache_dir, f'{hashlib.sha1(url.encode("utf-8")).hexdigest()}.json')
+
+    def read(self, url):
+        try:
+            with open(self.entry_path(url), 'r', encoding='utf-8') as entry_json:
+                entry = json.load(entry_json)
+            if entry['url'] == url:
+                return entry
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def write(self, entry):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entry_path = self.entry_path(entry['url'])
+            tmp_path = entry_path.with_suffix(f'.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as entry_json:
+                json.dump(entry, entry_json, ensure_ascii=False)
+            with self.lock:
+                os.replace(tmp_path, entry_path)
+        except OSError:
+            write_log(traceback.format_exc())
+
+    def get_cached_json(self, url):
+        # Dernière réponse connue, quel que soit son âge
+        entry = self.read(url)
+        if entry is not None:
+            return entry['body']
+        return None
+
+    def get_json(self, url, timeout=5):
+        if url in self.checked:
+            return self.checked[url]
+        entry = self.read(url)
+        now = time.time()
+        if entry is not None and now - entry['fetched'] < self.ttl:
+            self.checked[url] = entry['body']
+            return entry['body']
+        # Requête conditionnelle si on a déjà une réponse en cache
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            req_page = http_client.get(url, headers=headers, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if entry is None:
+                raise
+            return self.stale_body(url, entry)
+        if (req_page.status_code >= 500 or req_page.status_code == 429) and entry is not None:
+            return self.stale_body(url, entry)
+        if req_page.status_code == 304 and entry is not None:
+            entry['fetched'] = now
+            self.write(entry)
+            self.checked[url] = entry['body']
+            return entry['body']
+        if req_page.status_code >= 400 and req_page.status_code != 404:
+            req_page.raise_for_status()
+        resp_dict = req_page.json()
+        self.write({
+            'url': url,
+            'fetched': now,
+            'etag': req_page.headers.get('ETag'),
+            'last_modified': req_page.headers.get('Last-Modified'),
+            'body': resp_dict
+        })
+        self.checked[url] = resp_dict
+        return resp_dict
+
+    def stale_body(self, url, entry):
+        # Serveur injoignable : dernière réponse connue, marquée comme ancienne
+        with self.lock:
+            self.stale[url] = entry['fetched']
+        self.checked[url] = entry['body']
+        return entry['body']
+
+    def stale_since(self, url):
+        # Date de la réponse utilisée si elle est ancienne (serveur injoignable), sinon None
+        return self.stale.get(url)
+
+    def info(self, langchoice):
+        # Affiche le contenu du cache
+        entries = []
+        total_size = 0
+        for entry_path in sorted(self.cache_dir.glob('*.json')):
+            total_size += entry_path.stat().st_size
+            try:
+                with open(entry_path, 'r', encoding='utf-8') as entry_json:
+                    entries.append(json.load(entry_json))
+            except (OSError, ValueError):
+                continue
+        now = time.time()
+        print(f'{langchoice.cache_api} : {self.cache_dir.resolve()} - {len(entries)} {langchoice.cache_entries}, '
+              f'{round(total_size / 1024, 1)} KB (ttl : {self.ttl // 60} min)')
+        for entry in sorted(entries, key=lambda item: item.get('url', '')):
+            age = int(now - entry.get('fetched', 0))
+            state = langchoice.cache_fresh if age < self.ttl else langchoice.cache_expired
+            validator = 'ETag' if entry.get('etag') else 'Last-Modified' if entry.get('last_modified') else '-'
+            print(f' - {entry.get("url")} : {age // 60} min ({state}, {validator})')
+
+    def purge(self, langchoice):
+        # Vide le cache
+        nb_entries = 0
+        for entry_path in self.cache_dir.glob('*.json'):
+            try:
+                entry_path.unlink()
+                nb_entries += 1
+            except OSError:
+                write_log(traceback.format_exc())
+        print(f'{langchoice.cache_api} : {nb_entries} {langchoice.cache_entries_removed}.')
+
+
+class ReleaseStore:
+    # Stockage local des fichiers de mods téléchargés, partagé entre les dossiers de mods (--modspath).
+    # Les fichiers sont rangés par empreinte sha256 (un seul exemplaire par contenu), l'index
+    # associe modid@version à une empreinte. Les fichiers les moins récemment utilisés sont supprimés
+    # quand la taille maximale est dépassée.
+    def __init__(self, store_dir, max_size):
+        self.store_dir = Path(store_dir)
+        self.objects_dir = Path(self.store_dir, 'objects')
+        self.index_file = Path(self.store_dir, 'index.json')
+        self.max_size = max_size  # en octets, 0 = stockage désactivé
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def release_key(modid, version):
+        return f'{str(modid).lower()}@{version}'
+
+    def load_index(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as index_json:
+                return json.load(index_json)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self, index):
+        tmp_file = self.index_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as index_json:
+            json.dump(index, index_json, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+
+    @staticmethod
+    def link_or_copy(src, dest):
+        # Lien physique si possible (même disque), sinon copie. Remplacement atomique de dest.
+        tmp_dest = Path(dest).with_name(f'{Path(dest).name}.part')
+        if tmp_dest.exists():
+            tmp_dest.unlink()
+        try:
+            os.link(src, tmp_dest)
+        except OSError:
+            shutil.copyfile(src, tmp_dest)
+        os.replace(tmp_dest, dest)
+
+    def install(self, modid, version, dest_path, on_size=None):
+        # Copie la release depuis le stockage si elle y est. Renvoie False sinon.
+        if self.max_size <= 0:
+            return False
+        with self.lock:
+            index = self.load_index()
+            entry = index.get(self.release_key(modid, version))
+            if entry is None:
+                return False
+            object_path = Path(self.objects_dir, entry['hash'])
+            try:
+                if object_path.stat().st_size != entry['size']:
+                    return False
+                if on_size is not None:
+                    on_size(entry['size'])
+                self.link_or_copy(object_path, dest_path)
+                entry['last_used'] = time.time()
+                self.save_index(index)
+            except OSError:
+                write_log(traceback.format_exc())
+                return False
+        return True
+
+    def add(self, modid, version, filepath):
+        # Ajoute une release téléchargée dans le stockage
+        if self.max_size <= 0:
+            return
+        try:
+            sha256 = hashlib.sha256()
+            with open(filepath, 'rb') as mod_file:
+                for chunk in iter(lambda: mod_file.read(1024 * 1024), b''):
+                    sha256.update(chunk)
+            file_hash = sha256.hexdigest()
+            with self.lock:
+                self.objects_dir.mkdir(parents=True, exist_ok=True)
+                object_path = Path(self.objects_dir, file_hash)
+                if not object_path.is_file():
+                    self.link_or_copy(filepath, object_path)
+                index = self.load_index()
+                index[self.release_key(modid, version)] = {
+                    'hash': file_hash,
+                    'filename': Path(filepath).name,
+                    'size': object_path.stat().st_size,
+                    'last_used': time.time()
+                }
+                self.evict(index)
+                self.save_index(index)
+        except OSError:
+            write_log(traceback.format_exc())
+
+    def evict(self, index):
+        # Supprime les fichiers les moins récemment utilisés au-delà de la taille maximale
+        objects = {}
+        for entry in index.values():
+            last_used = max(objects.get(entry['hash'], (0, 0))[1], entry['last_used'])
+            objects[entry['hash']] = (entry['size'], last_used)
+        total_size = sum(size for size, last_used in objects.values())
+        for file_hash, (size, last_used) in sorted(objects.items(), key=lambda item: item[1][1]):
+            if total_size <= self.max_size:
+                break
+            try:
+                Path(self.objects_dir, file_hash).unlink()
+            except FileNotFoundError:
+                pass
+            for key in [key for key, entry in index.items() if entry['hash'] == file_hash]:
+                del index[key]
+            total_size -= size
+
+    def info(self, langchoice):
+        index = self.load_index()
+        sizes = {entry['hash']: entry['size'] for entry in index.values()}
+        print(f'{langchoice.cache_store} : {self.store_dir.resolve()} - {len(index)} {langchoice.cache_releases}, '
+              f'{round(sum(sizes.values()) / (1024 ** 2), 1)}/{round(self.max_size / (1024 ** 2))} MB')
+        for key, entry in sorted(index.items()):
+            print(f' - {key} : {entry["filename"]}')
+
+    def purge(self, langchoice):
+        with self.lock:
+            if self.store_dir.is_dir():
+                shutil.rmtree(self.store_dir)
+        print(f'{langchoice.cache_store} : {langchoice.cache_emptied}.')
+
+
+class ModInfoIndex:
+    # Index des infos modinfo (name, modid, version, description, path, dependencies) de chaque fichier de mod.
+    # Construit une fois par exécution et sauvegardé sur disque : une archive dont la taille et la date
+    # de modification n'ont pas changé n'est plus rouverte aux exécutions suivantes.
+    index_format = 2
+
+    def __init__(self, extract_modinfo, index_file):
+        self.extract_modinfo = extract_modinfo
+        self.index_file = Path(index_file)
+        self.records = {}  # index de l'exécution en cours
+        self.saved_records = None  # index sauvegardé sur disque (chargé au premier accès)
+        self.changed = False
+
+    def load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as index_json:
+                content = json.load(index_json)
+            if content['format'] == self.index_format:
+                self.saved_records = content['mods']
+        except (OSError, ValueError, KeyError, TypeError):
+            self.saved_records = {}
+
+    def is_indexed(self, filepath):
+        # Vrai si le fichier est dans l'index sauvegardé et n'a pas changé
+        if self.saved_records is None:
+            self.load()
+        entry = self.saved_records.get(os.path.abspath(filepath))
+        if entry is None:
+            return False
+        try:
+            file_stat = os.stat(filepath)
+        except OSError:
+            return False
+        return entry['size'] == file_stat.st_size and entry['mtime'] == file_stat.st_mtime_ns
+
+    def get(self, filepath, modinfo_content=None, modinfo_data=None):
+        # modinfo_content / modinfo_data : contenu de modinfo.json s'il a déjà été lu / analysé (évite de rouvrir l'archive)
+        key = os.path.abspath(filepath)
+        if key in self.records:
+            return self.records[key]
+        if self.saved_records is None:
+            self.load()
+        try:
+            file_stat = os.stat(key)
+        except OSError:
+            return self.extract_modinfo(filepath, modinfo_content, modinfo_data)
+        entry = self.saved_records.get(key)
+        if entry is not None and entry['size'] == file_stat.st_size and entry['mtime'] == file_stat.st_mtime_ns:
+            modinfo_values = (entry['name'], entry['modid'], entry['version'],
+                              entry['description'], Path(filepath), entry['dependencies'])
+        else:
+            modinfo_values = self.extract_modinfo(filepath, modinfo_content, modinfo_data)
+            # On ne garde pas les fichiers illisibles pour qu'ils soient à nouveau signalés dans le log
+            if modinfo_values[0] is not None and modinfo_values[2] is not None:
+                self.saved_records[key] = {
+                    'size': file_stat.st_size,
+                    'mtime': file_stat.st_mtime_ns,
+                    'name': modinfo_values[0],
+                    'modid': modinfo_values[1],
+                    'version': modinfo_values[2],
+                    'description': modinfo_values[3],
+                    'dependencies': modinfo_values[5]
+                }
+                self.changed = True
+        self.records[key] = modinfo_values
+        return modinfo_values
+
+    def save(self):
+        if self.saved_records is None:
+            return
+        # On retire les fichiers qui n'existent plus (mods mis à jour ou supprimés)
+        for key in [key for key in self.saved_records if not os.path.isfile(key)]:
+            del self.saved_records[key]
+            self.changed = True
+        if not self.changed:
+            return
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as index_json:
+                json.dump({'format': self.index_format, 'mods': self.saved_records},
+                          index_json, ensure_ascii=False)
+            os.replace(tmp_file, self.index_file)
+            self.changed = False
+        except OSError:
+            write_log(traceback.format_exc())
+
+
+class ZipValidationCache:
+    # Cache des archives déjà vérifiées (clé : chemin, taille, date de modification et empreinte sha256 optionnelle).
+    # mode 'full' : contrôle CRC complet (testzip) lors de la première vérification d'une archive
+    # mode 'fast' : contrôle du répertoire central uniquement
+    # deep_verify : contrôle CRC complet de toutes les archives, sans utiliser le cache
+    levels = {'fast': 1, 'full': 2}
+
+    def __init__(self, cache_file, mode='full', deep_verify=False, use_hash=False):
+        self.cache_file = Path(cache_file)
+        self.mode = mode if mode in self.levels else 'full'
+        self.deep_verify = deep_verify
+        self.use_hash = use_hash
+        self.records = None
+        self.changed = False
+        self.lock = threading.Lock()
+
+    @property
+    def level(self):
+        return 'full' if self.deep_verify else self.mode
+
+    def load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as cache_json:
+                self.records = json.load(cache_json)
+        except (OSError, ValueError):
+            self.records = {}
+
+    @staticmethod
+    def file_hash(filepath):
+        sha256 = hashlib.sha256()
+        with open(filepath, 'rb') as zip_file:
+            for chunk in iter(lambda: zip_file.read(1024 * 1024), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def is_known_valid(self, filepath):
+        if self.deep_verify:
+            return False
+        key = os.path.abspath(filepath)
+        with self.lock:
+            if self.records is None:
+                self.load()
+            entry = self.records.get(key)
+        if entry is None or self.levels.get(entry['level'], 0) < self.levels[self.level]:
+            return False
+        file_stat = os.stat(key)
+        if entry['size'] != file_stat.st_size:
+            return False
+        if entry['mtime'] == file_stat.st_mtime_ns:
+            return True
+        # Date modifiée mais contenu identique (copie, restauration...)
+        if self.use_hash and entry.get('sha256') and entry['sha256'] == self.file_hash(key):
+            with self.lock:
+                entry['mtime'] = file_stat.st_mtime_ns
+                self.changed = True
+            return True
+        return False
+
+    def set_valid(self, filepath):
+        key = os.path.abspath(filepath)
+        file_stat = os.stat(key)
+        entry = {'size': file_stat.st_size, 'mtime': file_stat.st_mtime_ns, 'level': self.level}
+        if self.use_hash:
+            entry['sha256'] = self.file_hash(key)
+        with self.lock:
+            if self.records is None:
+                self.load()
+            self.records[key] = entry
+            self.changed = True
+
+    @staticmethod
+    def check_central_directory(zip_file, file_size):
+        # Mode rapide : chaque fichier du répertoire central doit être contenu dans l'archive
+        for info in zip_file.infolist():
+            if info.header_offset + info.compress_size > file_size:
+                return info.filename
+        return None
+
+    def save(self):
+        with self.lock:
+            if self.records is None:
+                return
+            for key in [key for key in self.records if not os.path.isfile(key)]:
+                del self.records[key]
+                self.changed = True
+            if not self.changed:
+                return
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix(f'.{os.getpid()}.tmp')
+                with open(tmp_file, 'w', encoding='utf-8') as cache_json:
+                    json.dump(self.records, cache_json)
+                os.replace(tmp_file, self.cache_file)
+                self.changed = False
+            except OSError:
+                write_log(traceback.format_exc())
+
+
+class IconCache:
+    # Miniatures des icônes des mods (modicon.png) pour le pdf, à la taille exacte de la cellule du tableau.
+    # Rangées par empreinte sha256 de l'icône : une même icône (autre exécution, autre mod) n'est réduite qu'une fois.
+    def __init__(self, cache_dir, size):
+        self.cache_dir = Path(cache_dir)
+        self.size = size  # en pixels
+        self.lock = threading.Lock()
+        self.icon_locks = {}
+
+    def thumbnail(self, icon_data):
+        # Chemin de la miniature de l'icône (contenu de modicon.png lu dans l'archive), None si l'image est illisible
+        from PIL import Image  # chargé seulement pour le pdf
+        icon_hash = hashlib.sha256(icon_data).hexdigest()
+        thumbnail_path = Path(self.cache_dir, f'{icon_hash}_{self.size}.png')
+        with self.lock:
+            icon_lock = self.icon_locks.setdefault(icon_hash, threading.Lock())
+        with icon_lock:
+            if thumbnail_path.is_file():
+                return thumbnail_path
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with Image.open(io.BytesIO(icon_data)) as icon:
+                    icon.thumbnail((self.size, self.size), Image.Resampling.LANCZOS)
+                    tmp_path = thumbnail_path.with_suffix(f'.{threading.get_ident()}.tmp')
+                    icon.save(tmp_path, format='PNG', optimize=True)
+                os.replace(tmp_path, thumbnail_path)
+            except (OSError, ValueError, Image.DecompressionBombError):
+                write_log(traceback.format_exc())
+                return None
+        return thumbnail_path
+
+    def info(self, langchoice):
+        thumbnails = list(self.cache_dir.glob('*.png'))
+        total_size = sum(thumbnail_path.stat().st_size for thumbnail_path in thumbnails)
+        print(f'{langchoice.cache_icons} : {self.cache_dir.resolve()} - {len(thumbnails)} {langchoice.cache_thumbnails} '
+              f'({self.size} px), '
+              f'{round(total_size / 1024, 1)} KB')
+
+    def purge(self, langchoice):
+        if self.cache_dir.is_dir():
+            shutil.rmtree(self.cache_dir)
+        print(f'{langchoice.cache_icons} : {langchoice.cache_emptied}.')
+
+
+class RunManifest:
+    # État d'un dossier de mods à la fin de la dernière exécution : pour chaque fichier, taille et date de modification,
+    # version locale, dernière version vue sur moddb et date de cette vérification.
+    # Si le dossier n'a pas changé et que toutes les vérifications sont récentes (ttl), il n'y a rien à refaire.
+    manifest_format = 1
+
+    def __init__(self, manifest_file, ttl):
+        self.manifest_file = Path(manifest_file)
+        self.ttl = ttl  # en secondes (0 = désactivé)
+        self.previous = None  # manifest de l'exécution précédente (chargé au premier accès)
+        self.mods = {}  # nom du fichier -> infos de l'exécution en cours
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def folder_state(path_mods):
+        # Identité des fichiers de mods sans les ouvrir : nom -> (taille, date de modification)
+        state = {}
+        try:
+            with os.scandir(path_mods) as entries:
+                for entry in entries:
+                    if entry.name.endswith(('.zip', '.cs')) and entry.is_file():
+                        file_stat = entry.stat()
+                        state[entry.name] = (file_stat.st_size, file_stat.st_mtime_ns)
+        except OSError:
+            pass
+        return state
+
+    def load(self):
+        if self.previous is None:
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as manifest_json:
+                    content = json.load(manifest_json)
+                self.previous = content if content['format'] == self.manifest_format else {}
+            except (OSError, ValueError, KeyError, TypeError):
+                self.previous = {}
+        return self.previous
+
+    def is_fresh(self, folder_state, settings):
+        # Vrai si le dossier est identique à la dernière exécution et que chaque mod a été vérifié il y a moins de ttl
+        previous = self.load()
+        if self.ttl <= 0 or not previous or previous.get('settings') != settings:
+            return False
+        previous_mods = previous['mods']
+        if folder_state.keys() != previous_mods.keys():
+            return False
+        now = time.time()
+        for filename, (size, mtime) in folder_state.items():
+            entry = previous_mods[filename]
+            if entry['size'] != size or entry['mtime'] != mtime:
+                return False
+            if entry['status'] == 'excluded':
+                continue
+            # Mod en erreur lors de la dernière exécution (archive invalide, moddb injoignable...) : on recommence
+            if entry['status'] not in ('checked', 'not_found') or now - entry['checked'] >= self.ttl:
+                return False
+        return True
+
+    def last_check(self):
+        checks = [entry['checked'] for entry in self.load().get('mods', {}).values() if entry.get('checked')]
+        return min(checks) if checks else None
+
+    def set_mod(self, filename, name, modid, version, status='error', remote_version=None):
+        # status : checked (vérifié sur moddb), not_found (absent de moddb), excluded, error (pas de vérification),
+        # stale (comparé à la dernière réponse connue de moddb, injoignable)
+        with self.lock:
+            self.mods[filename] = {
+                'name': name,
+                'modid': modid,
+                'version': version,
+                'status': status,
+                'remote_version': remote_version,
+                'checked': time.time() if status in ('checked', 'not_found') else None
+            }
+
+    def remove_mod(self, filename):
+        with self.lock:
+            self.mods.pop(filename, None)
+
+    def changes(self):
+        # Mods ajoutés, supprimés et modifiés depuis la dernière exécution (par modid)
+        previous = self.load()
+        if not previous:
+            return [], [], []
+        previous_mods = {entry['modid']: entry for entry in previous['mods'].values() if entry.get('modid')}
+        current_mods = {entry['modid']: entry for entry in self.mods.values() if entry.get('modid')}
+        added = [current_mods[modid] for modid in current_mods if modid not in previous_mods]
+        removed = [previous_mods[modid] for modid in previous_mods if modid not in current_mods]
+        changed = [(previous_mods[modid], current_mods[modid]) for modid in current_mods
+                   if modid in previous_mods and previous_mods[modid]['version'] != current_mods[modid]['version']]
+        return added, removed, changed
+
+    def save(self, path_mods, settings):
+        mods = {}
+        for filename, (size, mtime) in self.folder_state(path_mods).items():
+            entry = dict(self.mods.get(filename, {'name': None, 'modid': None, 'version': None,
+                                                  'status': 'error', 'remote_version': None, 'checked': None}))
+            entry['size'] = size
+            entry['mtime'] = mtime
+            mods[filename] = entry
+        content = {'format': self.manifest_format, 'path': str(path_mods), 'settings': settings, 'mods': mods}
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.manifest_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as manifest_json:
+                json.dump(content, manifest_json, ensure_ascii=False)
+            os.replace(tmp_file, self.manifest_file)
+            self.previous = content
+        except OSError:
+            write_log(traceback.format_exc())
 
 
 class VSUpdate:
-    def __init__(self, pathmods):
+    # Données partagées entre les dossiers de mods traités dans la même exécution (mode multi-dossiers)
+    shared_catalogue = None
+    shared_changelogs = {}
+    shared_release_versions = {}
+    shared_dependencies = {}
+    # Mods fournis avec le jeu : jamais recherchés sur moddb
+    game_modids = {'game', 'survival', 'creative'}
+
+    def __init__(self, pathmods, langchoice, instance=None):
         # ##### Version du script pour affichage titre.
         super().__init__()
         # #####
+        # Contexte partagé (config.ini et textes de la langue choisie)
+        self.langchoice = langchoice
         # Définition des chemins
         self.config_file = Path('config.ini')
         self.path_temp = Path("temp")
         self.path_logs = Path("logs")
+        self.path_cache = Path("cache")
         self.path_mods = Path(pathmods)
-        self.url_api = 'https://mods.vintagestory.at/api/mod/'
+        # Nom du dossier de mods en mode multi-dossiers (utilisé pour le nom du fichier log)
+        self.instance = instance
+        self.url_api = f'{self.langchoice.url_mods}api/mod/'
+        self.url_api_mods = f'{self.langchoice.url_mods}api/mods'
         self.crashlog_path = Path('logs').joinpath('crash-log.txt')
         self.lang_name = ''
+        # Nombre de requêtes simultanées vers l'API (--workers sinon config.ini)
+        self.workers = args.workers if args.workers else 8
         # Creation des dossiers et fichiers
         if not self.path_temp.is_dir():
             os.mkdir('temp')
@@ -226,17 +1557,17 @@ class VSUpdate:
         if not self.config_file.is_file():
             if args.nopause == 'false':
                 print(
-                    f'\n\t\t[bold cyan]{LanguageChoice().first_launch_title}[/bold cyan]\n')
+                    f'\n\t\t[bold cyan]{self.langchoice.first_launch_title}[/bold cyan]\n')
                 i = 1
-                for lan_2L, item in LanguageChoice().dic_lang.items():
+                for lan_2L, item in self.langchoice.dic_lang.items():
                     print(f'\t\t - {i}) {item[1]}, {item[0]}')
                     i += 1
             if args.nopause == 'false':
                 lang_choice_result = Prompt.ask(
-                    f'\n\t\t[bold cyan]{LanguageChoice().first_launch_lang_choice}[/bold cyan]',
+                    f'\n\t\t[bold cyan]{self.langchoice.first_launch_lang_choice}[/bold cyan]',
                     choices=['1', '2', '3', '4', '5', '6', '7', '8'],
                     show_choices=False, default='2')
-                for region, lang_ext in LanguageChoice().dic_lang.items():
+                for region, lang_ext in self.langchoice.dic_lang.items():
                     if lang_choice_result == lang_ext[2]:
                         langue_file_name = f'{lang_ext[0]}_{region}.json'
                         self.file_lang_path = Path('lang', langue_file_name)
@@ -245,7 +1576,7 @@ class VSUpdate:
                 if args.language:
                     langue_file_name = f'{args.language}.json'
                     self.file_lang_path = Path('lang', langue_file_name)
-                    for region, lang_ext in LanguageChoice().dic_lang.items():
+                    for region, lang_ext in self.langchoice.dic_lang.items():
                         # On récupere le nom de la langue
                         if region == args.language.split('_')[1]:
                             self.lang_name = lang_ext[1]
@@ -254,50 +1585,63 @@ class VSUpdate:
                     self.lang_name = 'English'
             # On crée le fichier config.ini
             self.set_config_ini()
-            # On récupère les valeurs de config.ini
-            self.config_read = configparser.ConfigParser(allow_no_value=True,
-                                                         interpolation=None)
-            self.config_read.read(self.config_file, encoding='utf-8-sig')
+            # On récupère les valeurs de config.ini (et la langue choisie)
+            self.langchoice.reload()
+            self.config_read = self.langchoice.config_read
             self.force_update = self.config_read.get('ModsUpdater',
                                                      'force_update')  # On récupère la valeur de force_update
             self.disable_mod_dev = self.config_read.get('ModsUpdater',
                                                         'disable_mod_dev')  # On récupère l'option pour la maj ou non des version dev des mod.
             print(
-                f'\n\t[bold cyan]{LanguageChoice().first_launch_config_done}[/bold cyan] :')
+                f'\n\t[bold cyan]{self.langchoice.first_launch_config_done}[/bold cyan] :')
             print(
-                f'\t\t- [bold cyan]{LanguageChoice().first_launch_lang_txt}[/bold cyan] : {self.lang_name}')
+                f'\t\t- [bold cyan]{self.langchoice.first_launch_lang_txt}[/bold cyan] : {self.lang_name}')
             print(
-                f'\t\t- [bold cyan]{LanguageChoice().first_launch_pathmods} : {self.path_mods}[/bold cyan]')
+                f'\t\t- [bold cyan]{self.langchoice.first_launch_pathmods} : {self.path_mods}[/bold cyan]')
             print(
-                f'\t\t- [bold cyan]{LanguageChoice().first_launch_game_ver_max}[/bold cyan]')
+                f'\t\t- [bold cyan]{self.langchoice.first_launch_game_ver_max}[/bold cyan]')
             print(f'\t\t- [bold cyan]force_Update : {self.force_update}[/bold cyan]')
             print(
                 f'\t\t- [bold cyan]disable_mod_dev : {self.disable_mod_dev}[/bold cyan]')
             # On demande de continuer ou on quitte
             if args.nopause == 'false':
-                print(f'\n\t[bold cyan]{LanguageChoice().first_launch2}[/bold cyan]')
-                maj_ok = Prompt.ask(f'\n\t{LanguageChoice().first_launch3}',
-                                    choices=[LanguageChoice().list_yesno[0],
-                                             LanguageChoice().list_yesno[1],
-                                             LanguageChoice().list_yesno[2],
-                                             LanguageChoice().list_yesno[3]])
-                if maj_ok == LanguageChoice().list_yesno[1] or maj_ok == \
-                        LanguageChoice().list_yesno[3]:
-                    print(f'{lang.end_of_prg} ')
+                print(f'\n\t[bold cyan]{self.langchoice.first_launch2}[/bold cyan]')
+                maj_ok = Prompt.ask(f'\n\t{self.langchoice.first_launch3}',
+                                    choices=[self.langchoice.list_yesno[0],
+                                             self.langchoice.list_yesno[1],
+                                             self.langchoice.list_yesno[2],
+                                             self.langchoice.list_yesno[3]])
+                if maj_ok == self.langchoice.list_yesno[1] or maj_ok == \
+                        self.langchoice.list_yesno[3]:
+                    print(f'{self.langchoice.end_of_prg} ')
                     if Path('temp').is_dir():
                         shutil.rmtree('temp')
                     time.sleep(2)
                     sys.exit()
 
-        # On charge le fichier config.ini
-        self.config_read = configparser.ConfigParser(allow_no_value=True,
-                                                     interpolation=None)
-        self.config_read.read(self.config_file, encoding='utf-8-sig')
-        if not args.modspath:
+        # Valeurs de config.ini (lues une seule fois pour toute l'exécution)
+        self.config_read = self.langchoice.config_read
+        if self.instance is not None:
+            # Mode multi-dossiers : le dossier de mods est imposé
+            self.path_mods = Path(pathmods)
+        elif not args.modspath:
             self.config_path = Path(self.config_read.get('ModPath', 'path'))
             self.path_mods = Path(self.config_path)
         else:
             self.path_mods = arg_modspath()
+        # Index des modinfo.json (un seul passage par fichier et par exécution)
+        self.modinfo_index = ModInfoIndex(self.extract_modinfo,
+                                          Path(self.path_cache, 'modinfo_index.json'))
+        # Manifest de la dernière exécution pour ce dossier de mods (ttl en minutes dans config.ini)
+        try:
+            manifest_ttl = self.config_read.getint('Cache', 'manifest_ttl', fallback=60)
+        except ValueError:
+            write_log('Error in config.ini [Cache] - manifest_ttl : integer expected')
+            manifest_ttl = 60
+        manifest_name = hashlib.sha1(os.path.abspath(self.path_mods).encode('utf-8')).hexdigest()
+        self.manifest = RunManifest(Path(self.path_cache, 'manifests', f'{manifest_name}.json'),
+                                    manifest_ttl * 60)
+        self.up_to_date = False
         # Définition des listes
         self.mod_filename = []
         self.mod_name_list = []
@@ -307,11 +1651,18 @@ class VSUpdate:
         self.liste_mod_maj_filename = []
         # Définition des dico
         self.mods_updated = {}
+        # moddb injoignable : mods comparés à la dernière réponse connue (nom -> (version locale, version en ligne,
+        # date de la réponse)) et mods sans réponse connue
+        self.mods_stale = {}
+        self.mods_unreachable = []
         # Définition des variables
         self.modename = None
         self.nb_maj = 0
         self.gamever_limit = self.config_read.get('Game_Version_max',
                                                   'version')  # On récupère la version max du jeu pour la maj
+        self.gamever_key = version_key(self.gamever_limit)
+        if self.gamever_key is None:
+            write_log(f'Error in config.ini [Game_Version_max] - version : invalid version {self.gamever_limit}')
         if args.forceupdate:  # On récupère la valeur de force_update
             self.force_update = args.forceupdate
         else:
@@ -321,25 +1672,33 @@ class VSUpdate:
         else:
             self.disable_mod_dev = self.config_read.get('ModsUpdater',
                                                         'disable_mod_dev')
-        self.modinfo_content = None
+        if args.bulk:
+            self.bulk_lookup = args.bulk
+        else:
+            self.bulk_lookup = self.config_read.get('ModsUpdater', 'bulk_lookup',
+                                                    fallback='false')
+        self.catalogue = None
+        if not args.workers:
+            try:
+                self.workers = self.config_read.getint('ModsUpdater', 'workers',
+                                                       fallback=8)
+            except ValueError:
+                write_log('Error in config.ini [ModsUpdater] - workers : integer expected')
+        self.workers = max(1, self.workers)
+        http_client.set_pool_size(self.workers)
+        # Nombre de processus pour l'analyse des archives (0 = nombre de coeurs)
+        try:
+            self.scan_workers = self.config_read.getint('ModsUpdater', 'scan_workers', fallback=0)
+        except ValueError:
+            write_log('Error in config.ini [ModsUpdater] - scan_workers : integer expected')
+            self.scan_workers = 0
+        if self.scan_workers <= 0:
+            self.scan_workers = os.cpu_count() or 1
+        # En dessous de ce nombre d'archives à analyser, le lancement des processus coûte plus qu'il ne rapporte
+        self.scan_threshold = 32
         self.version_locale = ''
         self.mod_last_version_online = ''
         self.user_language = ''
-        # variables json_correction
-        self.name_json = ''
-        self.version_json = ''
-        self.modid_json = ''
-        self.moddesc_json = ''
-        self.regex_name_json = ''
-        self.result_name_json = ''
-        self.regex_version_json = ''
-        self.result_version_json = ''
-        self.regex_modid_json = ''
-        self.result_modid_json = ''
-        self.regex_moddesc_json = ''
-        self.result_moddesc_json = ''
-        # variables extract_modinfo
-        self.filepath = ''
         # Accueil
         self.version = ''
         # Update_mods
@@ -366,10 +1725,31 @@ class VSUpdate:
             config.set('ModsUpdater',
                        '# Allow to disable or enable update of mod in dev or prerelease (true/false default=false).')
             config.set('ModsUpdater', 'disable_mod_dev', 'false')
+            config.set('ModsUpdater',
+                       '# Number of mods checked simultaneously on moddb (default=8).')
+            config.set('ModsUpdater', 'workers', str(self.workers))
+            config.set('ModsUpdater',
+                       '# Get the list of all moddb mods in one request instead of one request per mod. Useful for big mods folders (true/false default=false).')
+            config.set('ModsUpdater', 'bulk_lookup', 'false')
+            config.set('ModsUpdater',
+                       '# Number of processes used to check the mod archives of big mods folders (0 = number of CPU cores, 1 = disabled, default=0).')
+            config.set('ModsUpdater', 'scan_workers', '0')
+            config.set('ModsUpdater',
+                       '# Maximum number of requests per second to each server (moddb, download server), lowered automatically if the server asks to slow down (0 = no limit, default=20).')
+            config.set('ModsUpdater', 'rate_limit', '20')
+            config.set('ModsUpdater',
+                       '# Number of new attempts for a request that failed (network error, timeout, server busy) (default=3).')
+            config.set('ModsUpdater', 'max_retries', '3')
+            config.set('ModsUpdater',
+                       '# Check of the mod archives: full (CRC of every file, only once per archive) or fast (zip structure only). Archives already checked are not checked again (default=full).')
+            config.set('ModsUpdater', 'zip_check', 'full')
+            config.set('ModsUpdater',
+                       '# Also recognize already checked archives by their content (sha256) when their date changed (true/false default=false).')
+            config.set('ModsUpdater', 'zip_check_hash', 'false')
             config.add_section('ModPath')
             config.set('ModPath', 'path', str(self.path_mods))
             config.add_section('Language')
-            config.set('Language', str(LanguageChoice().language_comment))
+            config.set('Language', str(self.langchoice.language_comment))
             #  Si l'argument lang a été transmis
             if args.language:
                 config.set('Language', 'language', args.language)  # from command line
@@ -378,10 +1758,29 @@ class VSUpdate:
                 resul_lang = re.search(regex_lang, str(self.file_lang_path))
                 config.set('Language', 'language', resul_lang[1])
             config.add_section('Game_Version_max')
-            config.set('Game_Version_max', LanguageChoice().setconfig01)
+            config.set('Game_Version_max', self.langchoice.setconfig01)
             config.set('Game_Version_max', 'version', '100.0.0')
+            config.add_section('Cache')
+            config.set('Cache',
+                       '# Time (in minutes) during which moddb responses are reused without asking the server again (0 = always revalidate, default=60).')
+            config.set('Cache', 'api_ttl', '60')
+            config.set('Cache',
+                       '# Folder where downloaded mods are kept to be reused by other mods folders, and its maximum size in MB (0 = disabled, default=1024).')
+            config.set('Cache', 'store_path', str(Path('cache', 'store')))
+            config.set('Cache', 'store_max_size', '1024')
+            config.set('Cache',
+                       '# Time (in minutes) during which a mods folder that has not changed since the last run is not checked again (0 = always check, default=60).')
+            config.set('Cache', 'manifest_ttl', '60')
+            config.add_section('ModDB')
+            config.set('ModDB',
+                       '# Address of moddb and of its download server. Only change them to use a mirror or a local test server.')
+            config.set('ModDB', 'url', LanguageChoice.default_url_mods)
+            config.set('ModDB', 'cdn_url', LanguageChoice.default_url_cdn)
+            config.add_section('Instances')
+            config.set('Instances',
+                       '# To update several mods folders in one run, add the path of each folder (path1 = ..., path2 = ...). If set, [ModPath] is ignored.')
             config.add_section('Mod_Exclusion')
-            config.set('Mod_Exclusion', LanguageChoice().setconfig)
+            config.set('Mod_Exclusion', self.langchoice.setconfig)
             if args.exclusion:
                 for i in range(0, len(args.exclusion)):
                     config.set('Mod_Exclusion', 'mod' + str(i + 1), args.exclusion[i])
@@ -390,88 +1789,38 @@ class VSUpdate:
                     config.set('Mod_Exclusion', 'mod' + str(i), '')
             config.write(cfgfile)
 
-    def json_correction(self, txt_json):
-        self.regex_name_json = r'"{0,1}name"{0,1} {0,}: {0,}"(.*)",{0,}'
-        self.result_name_json = re.search(self.regex_name_json, txt_json,
-                                          flags=re.IGNORECASE)
-        self.regex_version_json = r'"{0,1}version"{0,1} {0,}: {0,}"(.*)",{0,}'
-        self.result_version_json = re.search(self.regex_version_json, txt_json,
-                                             flags=re.IGNORECASE)
-        self.regex_modid_json = r'"{0,1}modid"{0,1} {0,}: {0,}"(.*)",{0,}'
-        self.result_modid_json = re.search(self.regex_modid_json, txt_json,
-                                           flags=re.IGNORECASE)
-        self.regex_moddesc_json = r'"{0,1}description"{0,1} {0,}: {0,}"(.*)",{0,}'
-        self.result_moddesc_json = re.search(self.regex_moddesc_json, txt_json,
-                                             flags=re.IGNORECASE)
-        if self.result_name_json:
-            self.name_json = self.result_name_json.group(2)
-        if self.result_version_json:
-            self.version_json = self.result_version_json.group(2)
-        if self.result_modid_json:
-            self.modid_json = self.result_modid_json.group(2)
-        if self.result_moddesc_json:
-            self.moddesc_json = self.result_moddesc_json.group(2)
-        print(
-            f'self.name_json:{self.name_json}\nself.version_json:{self.version_json}\nself.modid_json:{self.modid_json}\nself.moddesc_json:{self.moddesc_json}')
-        return self.name_json, self.version_json, self.modid_json, self.moddesc_json
-
-    def extract_modinfo(self, file):
+    def extract_modinfo(self, file, modinfo_content=None, modinfo_data=None):
         mod_name = None
         mod_modid = None
         mod_version = None
         mod_description = None
+        mod_dependencies = {}
+        mod_filepath = Path(self.path_mods, file)
         # On trie les fichiers .zip et .cs
         type_file = Path(file).suffix
         if type_file == '.zip':
-            # On lit le fichier modinfo.json de l'archive et on recupere le modid, name et version
-            self.filepath = Path(self.path_mods, file)
-            if zipfile.is_zipfile(self.filepath):  # Vérifie si fichier est un Zip valide
-                with zipfile.ZipFile(self.filepath) as fichier_zip:
-                    with fichier_zip.open('modinfo.json') as modinfo_json:
-                        self.modinfo_content = modinfo_json.read().decode('utf-8-sig')
+            # On lit le fichier modinfo.json de l'archive et on recupere le modid, name, version et les dépendances
             try:
-                regex_name = r'"{0,1}name"{0,1} {0,}: {0,}"(.*)",{0,}'
-                result_name = re.search(regex_name, self.modinfo_content,
-                                        flags=re.IGNORECASE)
-                regex_modid = r'"{0,1}modid"{0,1} {0,}: {0,}"(.*)",{0,}'
-                result_modid = re.search(regex_modid, self.modinfo_content,
-                                         flags=re.IGNORECASE)
-                regex_version = r'"{0,1}version"{0,1} {0,}: {0,}"(.*)",{0,}'
-                result_version = re.search(regex_version, self.modinfo_content,
-                                           flags=re.IGNORECASE)
-                regex_description = r'"{0,1}description"{0,1} {0,}: {0,}"(.*)",{0,}'
-                result_description = re.search(regex_description, self.modinfo_content,
-                                               flags=re.IGNORECASE)
-                mod_name = result_name.group(1)
-                if result_modid is not None:
-                    mod_modid = result_modid.group(1)
+                if modinfo_data is None:  # modinfo.json pas encore lu par scan_mod_archive
+                    if modinfo_content is None:
+                        modinfo_content = scan_mod_archive(mod_filepath)['modinfo']
+                    modinfo_data = parse_modinfo(modinfo_content)
+                mod_name = str(modinfo_data['name'])
+                if modinfo_data.get('modid'):
+                    mod_modid = str(modinfo_data['modid'])
                 else:
                     mod_modid = mod_name.replace(" ", "").lower()
-                mod_version = result_version.group(1)
-                if result_description is not None:
-                    mod_description = result_description.group(1)
-                else:
-                    mod_description = ''
+                mod_version = str(modinfo_data['version'])
+                mod_description = str(modinfo_data.get('description') or '')
+                if isinstance(modinfo_data.get('dependencies'), dict):
+                    mod_dependencies = {str(dep_modid): str(dep_version or '')
+                                        for dep_modid, dep_version in modinfo_data['dependencies'].items()}
             except Exception:
-                try:
-                    json_correct = self.json_correction(self.modinfo_content)
-                    mod_name = json_correct[0]
-                    mod_version = json_correct[1]
-                    mod_modid = json_correct[2]
-                    if json_correct[3] is not None:
-                        mod_description = json_correct[3]
-                    else:
-                        mod_description = ''
-                except Exception:
-                    # print(f'[red]{LanguageChoice().error_msg}[/red]')  # debug
-                    msg_error = f'{file} :\n\n\t {traceback.format_exc()}'
-                    write_log(msg_error)
                 # print(f'[red]{LanguageChoice().error_msg}[/red]')  # debug
                 msg_error = f'{file} :\n\n\t {traceback.format_exc()}'
                 write_log(msg_error)
         elif type_file == '.cs':
-            self.filepath = Path(self.path_mods, file)
-            with open(self.filepath, "r", encoding='utf-8-sig') as fichier_cs:
+            with open(mod_filepath, "r", encoding='utf-8-sig') as fichier_cs:
                 cs_file = fichier_cs.read()
                 regexp_name = '(namespace )(\\w*)'
                 result_name = re.search(regexp_name, cs_file, flags=re.IGNORECASE)
@@ -484,49 +1833,80 @@ class VSUpdate:
                 mod_version = result_version[2]
                 mod_modid = mod_name
                 mod_description = result_description[1]
-        return mod_name, mod_modid, mod_version, mod_description, self.filepath
+        return mod_name, mod_modid, mod_version, mod_description, mod_filepath, mod_dependencies
+
+    def modinfo(self, file):
+        # Infos du mod via l'index (extract_modinfo n'est appelé que si le fichier a changé)
+        return self.modinfo_index.get(Path(self.path_mods, file))
 
     @staticmethod
-    def test_zip_validity(filepath):
-        """Vérifie si le fichier est un ZIP valide et non corrompu."""
-        try:
-            # Vérifier si le fichier est un ZIP valide
-            if not zipfile.is_zipfile(filepath):
-                msg_error = f"The file {filepath} is not a valid ZIP file."
-                print(f"[red]{msg_error}[/red]")
-                write_log(msg_error)
-                return False
+    def scan_zip(filepath, read_modinfo=True, read_icon=False):
+        """Vérifie l'archive (si pas déjà vérifiée) et lit modinfo.json et modicon.png en une seule ouverture."""
+        known_valid = zip_validation.is_known_valid(filepath)
+        record = scan_mod_archive(filepath, None if known_valid else zip_validation.level,
+                                  read_modinfo, read_icon)
+        return VSUpdate.check_scan(filepath, record, known_valid)
 
-            # Ouvrir le fichier ZIP et tester son intégrité
-            with zipfile.ZipFile(filepath, 'r') as zip_file:
-                corrupted_file = zip_file.testzip()
-                if corrupted_file is not None:
-                    msg_error = f"The ZIP file {filepath} is corrupted: {corrupted_file}"
-                    print(f"[red]{msg_error}[/red]")
-                    write_log(msg_error)
-                    return False
+    @staticmethod
+    def check_scan(filepath, record, known_valid):
+        """Affiche l'erreur éventuelle de l'analyse d'une archive, sinon la note comme vérifiée."""
+        if record['error'] is not None:
+            print(f"[red]{record['error']}[/red]")
+            write_log(record['error'])
+            return None
+        if not known_valid:
+            zip_validation.set_valid(filepath)
+        return record
 
-            # Si le fichier passe les deux tests, il est valide
+    @staticmethod
+    def test_zip_validity(filepath):
+        """Vérifie si le fichier est un ZIP valide et non corrompu."""
+        # Archive déjà vérifiée et inchangée
+        if zip_validation.is_known_valid(filepath):
             return True
-        except Exception as e:
-            print(f"[red]Error occurred while processing {filepath}: {e}[/red]")
-            return False
+        return VSUpdate.scan_zip(filepath, read_modinfo=False) is not None
+
+    def scan_archives(self, to_scan):
+        """Analyse les archives (liste de (fichier, déjà vérifiée)), en parallèle sur plusieurs processus pour les gros dossiers."""
+        paths = [str(elem) for elem, known_valid in to_scan]
+        levels = [None if known_valid else zip_validation.level for elem, known_valid in to_scan]
+        if self.scan_workers > 1 and len(paths) >= self.scan_threshold:
+            nb_process = min(self.scan_workers, len(paths))
+            try:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=nb_process) as executor:
+                    # Plusieurs archives par envoi pour limiter les échanges entre processus
+                    chunksize = max(1, len(paths) // (nb_process * 4))
+                    return list(executor.map(scan_mod_archive, paths, levels, chunksize=chunksize))
+            except (OSError, concurrent.futures.BrokenExecutor) as e:
+                # Processus indisponibles (système, exécutable...) : analyse dans le processus courant
+                write_log(f'Parallel scan of the mods folder unavailable, serial scan used: {e}')
+        return [scan_mod_archive(path, level) for path, level in zip(paths, levels)]
 
     def liste_complete_mods(self):
         # On crée la liste contenant les noms des fichiers zip des mods
-        for elem in self.path_mods.glob('*.zip'):
-            # Vérifier la validité du fichier ZIP
-            if not self.test_zip_validity(elem):
+        zip_files = list(self.path_mods.glob('*.zip'))
+        # Archive déjà vérifiée et déjà dans l'index des modinfo : rien à ouvrir
+        to_scan = []
+        for elem in zip_files:
+            known_valid = zip_validation.is_known_valid(elem)
+            if not (known_valid and self.modinfo_index.is_indexed(elem)):
+                to_scan.append((elem, known_valid))
+        # Sinon une seule ouverture par archive : vérification, présence et lecture de 'modinfo.json'
+        records = {}
+        for (elem, known_valid), record in zip(to_scan, self.scan_archives(to_scan)):
+            records[elem] = self.check_scan(elem, record, known_valid)
+        for elem in zip_files:
+            if elem not in records:
+                self.mod_filename.append(elem.name)
+                continue
+            record = records[elem]
+            if record is None:
                 continue  # Ignore les fichiers invalides ou corrompus
+            if record['has_modinfo']:
+                self.modinfo_index.get(elem, record['modinfo'], record['modinfo_data'])
+                self.mod_filename.append(elem.name)
 
-            # Ouvrir le fichier ZIP et vérifier qu'il contient le fichier 'modinfo.json'
-            with zipfile.ZipFile(elem, 'r') as mod_zipfile:
-                try:
-                    mod_zipfile.getinfo(
-                        'modinfo.json')  # Vérifier la présence du fichier 'modinfo.json'
-                    self.mod_filename.append(elem.name)
-                except KeyError:
-                    pass  # Si 'modinfo.json' n'est pas trouvé, on l'ignore
+        zip_validation.save()
 
         # On ajoute les fichiers .cs
         for elem_cs in self.path_mods.glob('*.cs'):
@@ -534,70 +1914,103 @@ class VSUpdate:
 
         # Si aucun fichier valide n'a été ajouté, afficher un message d'erreur et quitter
         if len(self.mod_filename) == 0:
-            print(f"{LanguageChoice().err_list}")
+            if self.instance is not None:
+                # Mode multi-dossiers : on passe au dossier suivant
+                print(f'[red]{self.langchoice.err_list_instance} : {self.path_mods}[/red]')
+                write_log(f'{self.langchoice.err_list_instance} : {self.path_mods}')
+                return self.mod_filename
+            print(f"{self.langchoice.err_list}")
             os.system("pause")
             sys.exit()
 
         return self.mod_filename
 
-    @staticmethod
-    def verif_formatversion(v1, v2):
-        new_ver1 = []
-        new_ver2 = []
-        ver1 = v1.split('.')
-        for elem in ver1:
-            if len(elem) == 2 and elem[0] == str(0):
-                new_ver1.append(elem[1:])
-            else:
-                new_ver1.append(elem)
-        version1 = f'{new_ver1[0]}.{new_ver1[1]}.{new_ver1[2]}'
-
-        ver2 = v2.split('.')
-        for elem in ver2:
-            if len(elem) == 2 and str(elem[0]) == str(0):
-                new_ver2.append(elem[1:])
-            else:
-                new_ver2.append(elem)
-        version2 = f'{new_ver2[0]}.{new_ver2[1]}.{new_ver2[2]}'
-        return version1, version2
-
     @staticmethod
     # Pour comparer la version locale et online
     def compversion_local(ver_loc, ver_online):  # (version locale, version online)
-        compver = ''
-        try:
-            compver = semver.compare(ver_loc, ver_online)
-        except Exception:
-            write_log(traceback.format_exc())
+        compver = compare_versions(ver_loc, ver_online)
+        if compver is None:
+            write_log(f'Invalid version number : {ver_loc} / {ver_online}')
+            return ''
         return compver
 
     @staticmethod
-    # Pour comparer avec la version minimal nécessaire du jeu
-    def compversion_first_min_version(ver_locale, first_min_ver):
-        compver = ''
-        try:
-            ver = VSUpdate.verif_formatversion(first_min_ver, ver_locale)
-            compver = semver.compare(ver[0], ver[1])
-        except Exception:
-            write_log(traceback.format_exc())
-        return compver
+    def release_versions(modid, releases):
+        # Clés de version de chaque release et de la version minimale du jeu qu'elle demande (tags),
+        # calculées une seule fois par mod : [(clé de version, clé de la version du jeu minimale, release)]
+        cache_key = (modid, len(releases), releases[0].get('created') if releases else None)
+        compiled = VSUpdate.shared_release_versions.get(cache_key)
+        if compiled is None:
+            compiled = []
+            for release in releases:
+                release_key = version_key(release.get('modversion'))
+                if release_key is None:
+                    write_log(f'{modid} : invalid release version {release.get("modversion")}')
+                    continue
+                game_keys = [game_key for game_key in map(version_key, release.get('tags') or []) if game_key is not None]
+                compiled.append((release_key, min(game_keys) if game_keys else None, release))
+            VSUpdate.shared_release_versions[cache_key] = compiled
+        return compiled
+
+    def select_release(self, modid, releases):
+        # Release la plus récente compatible avec la version max du jeu (et stable si disable_mod_dev)
+        selected = None
+        for release_key, game_key, release in self.release_versions(modid, releases):
+            if self.disable_mod_dev.lower() == 'true' and release_key[1] == 0:
+                continue
+            if self.gamever_key is not None and game_key is not None and game_key > self.gamever_key:
+                continue
+            if selected is None or release_key > selected[0]:
+                selected = (release_key, release)
+        return selected
+
+    @staticmethod
+    def changelog_lines(changelog_html):
+        # Texte du changelog d'une release (html court fourni par l'API), une entrée par ligne
+        changelog_text = re.sub(r'<br\s*/?>|</p>|</li>|</h\d>|</div>', '\n', changelog_html or '',
+                                flags=re.IGNORECASE)
+        changelog_text = html.unescape(re.sub(r'<[^>]*>', '', changelog_text))
+        lst_log_desc = []
+        for line in changelog_text.split('\n'):
+            # On retire les caratceres spéciaux en début de ligne si il y en a
+            line = re.sub(r'^[\W*]*', '', line.strip())
+            if line != '':
+                lst_log_desc.append(line)
+        return lst_log_desc
 
     @staticmethod
-    def get_max_version(versions):  # uniquement versions stables
-        regexp_max_version = 'v([\\d.]*)([\\W\\w]*)'
-        max_version = re.search(regexp_max_version, max(versions))
-        max_version = max_version[1]
-        return max_version
+    def get_changelog_api(releases, version_locale, version_online, url):
+        # Changelogs de toutes les versions entre la version installée (exclue) et la nouvelle (incluse)
+        # à partir des releases de la réponse de l'API : aucune requête supplémentaire.
+        # None si l'API ne fournit pas les changelogs.
+        if not any('changelog' in release for release in releases):
+            return None
+        log = {}
+        new_releases = []
+        local_key = version_key(version_locale)
+        online_key = version_key(version_online)
+        for release in releases:
+            release_key = version_key(release.get('modversion'))
+            if None not in (release_key, local_key, online_key) and local_key < release_key <= online_key:
+                new_releases.append(release)
+        if not new_releases:
+            # Version installée identique (force_update) ou non comparable : changelog de la nouvelle version
+            new_releases = [release for release in releases if release.get('modversion') == version_online][:1]
+        for release in new_releases:
+            log[f'v{release["modversion"]}'] = VSUpdate.changelog_lines(release.get('changelog'))
+        log['url'] = url
+        return log
 
     @staticmethod
     def get_changelog(url):
-        # Scrap pour recuperer le changelog
-        req_url = urllib.request.Request(url)
+        # Scrap de la page du mod pour recuperer le dernier changelog (si l'API ne fournit pas les changelogs)
         log = {}
         lst_log_desc = []
         try:
-            urllib.request.urlopen(req_url)
-            req_page_url = requests.get(url, timeout=5)
+            # BeautifulSoup n'est chargé que si la page doit être lue
+            from bs4 import BeautifulSoup
+            req_page_url = http_client.get(url, timeout=5)
+            req_page_url.raise_for_status()
             page = req_page_url.content
             soup = BeautifulSoup(page, features="html.parser")
             soup_full_changelog = soup.find("div", {"class": "changelogtext"})
@@ -638,29 +2051,28 @@ class VSUpdate:
         except requests.exceptions.ReadTimeout:
             write_log(
                 'ReadTimeout error: Server did not respond within the specified timeout.')
-        except urllib.error.URLError as err_url:
+        except requests.exceptions.RequestException as err_url:
             # Affiche de l'erreur si le lien n'est pas valide
             # print(f'[red]{LanguageChoice().error_msg}[/red]')  # debug
-            msg_error = f'{err_url.reason} : {url}'
+            msg_error = f'{err_url} : {url}'
             write_log(msg_error)
         return log
 
     def accueil(
             self):  # le _ en debut permet de lever le message "Parameter 'net_version' value is not used
         if self.gamever_limit == '100.0.0':
-            self.version = LanguageChoice().version_max
+            self.version = self.langchoice.version_max
         else:
             self.version = self.gamever_limit
         # *** Texte d'accueil ***
-        column, row = os.get_terminal_size()
-        txt_title01 = f'\n\n[bold cyan]{LanguageChoice().title} - v.{__version__} {LanguageChoice().author}[/bold cyan]'
+        column, row = shutil.get_terminal_size()
+        txt_title01 = f'\n\n[bold cyan]{self.langchoice.title} - v.{__version__} {self.langchoice.author}[/bold cyan]'
         lines01 = txt_title01.splitlines()
         for line in lines01:
             print(line.center(column))
-        # On vérifie si une version plus récente du script est en ligne
-        maj_script = MajScript()
-        maj_script.check_update_script()
-        txt_title02 = f'\n[cyan]{LanguageChoice().title2} : [bold]{self.version}[/bold][/cyan]\n'
+        # Nouvelle version du script (si la vérification en arrière-plan est déjà terminée)
+        maj_script.show(wait=False)
+        txt_title02 = f'\n[cyan]{self.langchoice.title2} : [bold]{self.version}[/bold][/cyan]\n'
         lines02 = txt_title02.splitlines()
         for line in lines02:
             print(f'{line.center(column)}')
@@ -682,135 +2094,451 @@ class VSUpdate:
                 write_log(msg_error)
                 sys.exit()
 
+    def manifest_settings(self):
+        # Réglages qui changent le résultat d'une vérification : le manifest n'est valable que pour ceux-ci
+        return {
+            'version': __version__,
+            'game_version_max': self.gamever_limit,
+            'disable_mod_dev': self.disable_mod_dev,
+            'exclusion': sorted(self.mods_exclu)
+        }
+
     def mods_list(self):
         # Création de la liste des mods à mettre à jour
+        # Dossier inchangé et vérifié récemment : rien à refaire
+        if self.force_update.lower() != 'true' and not zip_validation.deep_verify and \
+                self.manifest.is_fresh(RunManifest.folder_state(self.path_mods), self.manifest_settings()):
+            # Aucune date si tous les mods sont exclus
+            last_check = self.manifest.last_check()
+            if last_check is None:
+                print(f'[green]{self.langchoice.manifest_unchanged}.[/green]\n')
+            else:
+                last_check = dt.datetime.fromtimestamp(last_check).strftime('%Y-%m-%d %H:%M:%S')
+                print(f'[green]{self.langchoice.manifest_unchanged} ({last_check}).[/green]\n')
+            self.up_to_date = True
+            return
         # On retire les mods issus de la liste d'exclusion
         self.liste_mod_maj_filename = self.liste_complete_mods()
+        if not self.liste_mod_maj_filename:
+            return  # Mode multi-dossiers : aucun mod valide, dossier ignoré
         self.liste_mod_maj_filename.sort(key=lambda s: s.casefold())
+        # On construit l'index des modinfo (mods exclus compris, pour le résumé)
+        for mod_file in self.liste_mod_maj_filename:
+            modinfo_values = self.modinfo(mod_file)
+            self.manifest.set_mod(mod_file, modinfo_values[0], modinfo_values[1], modinfo_values[2],
+                                  'excluded' if mod_file in self.mods_exclu else 'error')
+        self.modinfo_index.save()
+        self.print_changes()
         for modexclu in self.mods_exclu:
             if modexclu in self.liste_mod_maj_filename:
                 self.liste_mod_maj_filename.remove(
                     modexclu)  # contient la liste des mods à mettre a jour avec les noms de fichier
-        # On vérifie si le mod est sur moddb
-        for mod_maj in self.liste_mod_maj_filename:
-            modid_value = self.extract_modinfo(mod_maj)[1]
-            mod_url_test = f'{self.url_api}{modid_value}'
-            req_page = requests.get(str(mod_url_test), timeout=5)
-            resp_dict = req_page.json()
-            statuscode = resp_dict['statuscode']
+        # On vérifie si le mod est sur moddb (catalogue complet ou requêtes en parallèle)
+        modids = [self.modinfo(mod_maj)[1] for mod_maj in self.liste_mod_maj_filename]
+        if self.bulk_lookup.lower() == 'true':
+            self.catalogue = self.get_catalogue()
+        if self.catalogue is not None:
+            statuscodes = ['200' if str(modid).lower() in self.catalogue else '404'
+                           for modid in modids]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+                statuscodes = list(executor.map(self.get_mod_statuscode, modids))
+        for mod_maj, statuscode in zip(list(self.liste_mod_maj_filename), statuscodes):
             if statuscode == '200':
                 # on crée la liste des mods à vérifier
                 self.mods_to_check.append(mod_maj)
             elif statuscode == '404':
                 # On retire de la liste le mod non présent
                 self.liste_mod_maj_filename.remove(mod_maj)
+                modinfo_values = self.modinfo(mod_maj)
+                self.manifest.set_mod(mod_maj, modinfo_values[0], modinfo_values[1], modinfo_values[2],
+                                      'not_found')
+            elif statuscode is None:
+                self.liste_mod_maj_filename.remove(mod_maj)
+                self.mods_unreachable.append(self.modinfo(mod_maj)[0])
+
+    def print_changes(self):
+        # Mods ajoutés, supprimés ou modifiés depuis la dernière exécution
+        added, removed, changed = self.manifest.changes()
+        if not (added or removed or changed):
+            return
+        print(f'[cyan]{self.langchoice.manifest_changes} : {len(added)} {self.langchoice.manifest_added}, '
+              f'{len(removed)} {self.langchoice.manifest_removed}, {len(changed)} {self.langchoice.manifest_changed}[/cyan]')
+        for entry in added:
+            print(f' [green]+ {entry["name"]} (v.{entry["version"]})[/green]')
+        for entry in removed:
+            print(f' [red]- {entry["name"]} (v.{entry["version"]})[/red]')
+        for previous_entry, entry in changed:
+            print(f' [yellow]~ {entry["name"]} : v.{previous_entry["version"]} -> v.{entry["version"]}[/yellow]')
+        print('\n')
 
-    @staticmethod
-    def normalize_version(version):
-        # Normaliser en supprimant les zéros inutiles dans les segments
-        version_parts = version.split('.')
-        # Enlever les zéros inutiles dans la partie 'patch'
-        version_parts[-1] = str(
-            int(version_parts[-1]))  # Convertir en entier et de retour en string
-        normalized_version = '.'.join(version_parts)
-        return normalized_version
+    def get_catalogue(self):
+        # Liste de tous les mods de moddb en une seule requête : index modid -> entrée du catalogue
+        if VSUpdate.shared_catalogue is not None:
+            return VSUpdate.shared_catalogue
+        try:
+            resp_dict = api_cache.get_json(self.url_api_mods, timeout=10)
+            catalogue = {}
+            for entry in resp_dict['mods']:
+                for modidstr in entry['modidstrs']:
+                    catalogue[modidstr.lower()] = entry
+            VSUpdate.shared_catalogue = catalogue
+            return catalogue
+        except Exception:
+            # On revient aux requêtes mod par mod
+            write_log(f'{self.url_api_mods}\n{traceback.format_exc()}')
+            return None
+
+    def get_mod_statuscode(self, modid):
+        # Appelé depuis le pool de threads de mods_list
+        mod_url_test = f'{self.url_api}{modid}'
+        try:
+            resp_dict = api_cache.get_json(str(mod_url_test), timeout=5)
+        except CircuitOpenError:
+            # moddb injoignable et aucune réponse connue pour ce mod (un seul message dans le log pour l'hôte)
+            return None
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.HTTPError) as err_url:
+            # moddb ne répond pas ou renvoie une erreur (5xx, 429) et aucune réponse connue pour ce mod
+            write_log(f'{err_url} : {modid}')
+            return None
+        return resp_dict['statuscode']
+
+    def get_mod_api(self, modid):
+        # Appelé depuis le pool de threads de update_mods
+        mod_url_api = f'{self.url_api}{modid}'
+        if self.catalogue is not None:
+            # Si le catalogue n'indique pas de release plus récente que la dernière réponse connue, on réutilise celle-ci
+            entry = self.catalogue.get(str(modid).lower())
+            resp_dict = api_cache.get_cached_json(str(mod_url_api))
+            if entry is not None and resp_dict is not None and resp_dict.get('statuscode') == '200':
+                releases = resp_dict['mod']['releases']
+                if releases and releases[0].get('created') == entry.get('lastreleased'):
+                    return resp_dict
+        return api_cache.get_json(str(mod_url_api), timeout=2)
 
     def update_mods(self):
         # Comparaison et maj des mods
+        # On récupère les infos locales des mods
+        mods_modinfo = {}
         for mod_maj in self.liste_mod_maj_filename:
-            modname_value = self.extract_modinfo(mod_maj)[0]
-            self.version_locale = self.extract_modinfo(mod_maj)[2]
-            modid_value = self.extract_modinfo(mod_maj)[1]
+            modinfo_values = self.modinfo(mod_maj)
+            modid_value = modinfo_values[1]
             if modid_value == '':
-                modid_value = re.sub(r'\s', '', modname_value).lower()
-            filename_value = self.extract_modinfo(mod_maj)[4]
-            # mod url in modDB
-            mod_url_api = f'{self.url_api}{modid_value}'
-            # On teste la validité du lien url
-            req = urllib.request.Request(str(mod_url_api))
+                modid_value = re.sub(r'\s', '', modinfo_values[0]).lower()
+            mods_modinfo[mod_maj] = (modinfo_values, modid_value)
+        # On interroge l'API pour tous les mods en parallèle, puis on traite les réponses dans l'ordre de la liste (affichage et résumé stables)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures_api = {
+                mod_maj: executor.submit(self.get_mod_api, modid_value)
+                for mod_maj, (modinfo_values, modid_value) in mods_modinfo.items()}
+            # Les téléchargements se font en parallèle dans un second pool
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as download_executor:
+                downloads = []
+                for mod_maj in self.liste_mod_maj_filename:
+                    download = self.update_mod(mods_modinfo[mod_maj][0], mods_modinfo[mod_maj][1], futures_api[mod_maj],
+                                               download_executor)
+                    if download is not None:
+                        downloads.append(download)
+                # On finalise les téléchargements dans l'ordre de la liste
+                for download in downloads:
+                    self.finish_download(download)
+        if not self.up_to_date:
+            self.resolve_dependencies()
+            self.manifest.save(self.path_mods, self.manifest_settings())
+
+    def installed_mods(self):
+        # Mods présents dans le dossier : modid (en minuscules) -> (version, nom du fichier)
+        installed = {}
+        for filename, entry in list(self.manifest.mods.items()):
+            if entry.get('modid'):
+                installed[str(entry['modid']).lower()] = (entry['version'], filename)
+        return installed
+
+    def dependency_needs(self, filenames, installed):
+        # Dépendances (modinfo.json) manquantes ou trop anciennes des mods donnés : modid -> (version minimale, mod demandeur)
+        needs = {}
+        for filename in filenames:
+            modinfo_values = self.modinfo(filename)
+            for dep_modid, dep_version in modinfo_values[5].items():
+                dep_key = dep_modid.lower()
+                if dep_key in self.game_modids:
+                    continue
+                # Version vide ou '*' : n'importe quelle version convient
+                min_version = dep_version if version_key(dep_version) is not None else None
+                if dep_key in installed:
+                    installed_version = installed[dep_key][0]
+                    if min_version is None or (compare_versions(installed_version, min_version) or 0) >= 0:
+                        continue
+                # On garde la version minimale la plus exigeante
+                if dep_key in needs and (min_version is None or (needs[dep_key][0] is not None and
+                                                                 compare_versions(needs[dep_key][0], min_version) >= 0)):
+                    continue
+                needs[dep_key] = (min_version, modinfo_values[0])
+        return needs
+
+    def resolve_dependencies(self):
+        # Dépendances des mods : les besoins des mods installés sont recherchés sur moddb en parallèle, puis ceux
+        # des dépendances téléchargées, niveau par niveau. Les réponses de l'API sont mémorisées pour toute
+        # l'exécution (bibliothèques communes à plusieurs mods ou à plusieurs dossiers de mods).
+        installed = self.installed_mods()
+        needs = self.dependency_needs(list(self.manifest.mods), installed)
+        resolved = set()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as download_executor:
+                while needs:
+                    futures_api = {dep_key: executor.submit(self.get_mod_api, dep_key) for dep_key in needs
+                                   if dep_key not in VSUpdate.shared_dependencies}
+                    downloads = []
+                    for dep_key, (min_version, required_by) in sorted(needs.items()):
+                        resolved.add(dep_key)
+                        download = self.install_dependency(dep_key, min_version, required_by, installed.get(dep_key),
+                                                           futures_api.get(dep_key), download_executor)
+                        if download is not None:
+                            downloads.append(download)
+                    new_files = []
+                    for download in downloads:
+                        if self.finish_download(download):
+                            new_filename = Path(download['new_filepath']).name
+                            installed[download['modid'].lower()] = (download['version_online'], new_filename)
+                            new_files.append(new_filename)
+                    # Niveau suivant : dépendances des mods qui viennent d'être téléchargés
+                    needs = {dep_key: need for dep_key, need in self.dependency_needs(new_files, installed).items()
+                             if dep_key not in resolved}
+        self.modinfo_index.save()
+
+    def install_dependency(self, dep_key, min_version, required_by, installed_entry, future_api, download_executor):
+        # Recherche d'une dépendance sur moddb et lancement de son téléchargement
+        required = f'{dep_key}' + (f' (>= v.{min_version})' if min_version else '')
+        try:
+            if dep_key not in VSUpdate.shared_dependencies:
+                VSUpdate.shared_dependencies[dep_key] = future_api.result()
+            resp_dict = VSUpdate.shared_dependencies[dep_key]
+            if resp_dict['statuscode'] != '200':
+                msg_error = f'{self.langchoice.dep_not_found} : {required}, {self.langchoice.dep_required_by} {required_by}'
+                print(f' [red]{msg_error}[/red]')
+                write_log(msg_error)
+                return None
+            releases = resp_dict['mod']['releases']
+            selected = self.select_release(dep_key, releases)
+            if selected is None or (min_version is not None and selected[0] < version_key(min_version)):
+                msg_error = f'{self.langchoice.dep_no_release} : {required}, {self.langchoice.dep_required_by} {required_by}'
+                print(f' [red]{msg_error}[/red]')
+                write_log(msg_error)
+                return None
+            release = selected[1]
+            if api_cache.stale_since(f'{self.url_api}{dep_key}') is not None:
+                print(f' [yellow]{required} {self.langchoice.dep_required_by} {required_by} : '
+                      f'{self.langchoice.moddb_down}, {self.langchoice.moddb_not_downloaded}[/yellow]')
+                return None
+            if installed_entry is not None and installed_entry[1] in self.mods_exclu:
+                print(f' [red]{required} {self.langchoice.dep_required_by} {required_by} : {self.langchoice.dep_excluded}[/red]')
+                return None
+            mod_name = resp_dict['mod'].get('name') or dep_key
+            version_locale = installed_entry[0] if installed_entry is not None else '-'
+            print(f' [green]{mod_name}[/green]: {self.langchoice.dep_of} {required_by} - {self.langchoice.compver1} : {version_locale} - {self.langchoice.compver2} : {release["modversion"]}')
+            old_filepath = Path(self.path_mods, installed_entry[1]) if installed_entry is not None else None
+            return self.start_download(mod_name, release.get('modidstr') or dep_key, version_locale, release,
+                                       old_filepath, resp_dict['mod']['assetid'], releases, download_executor)
+        except CircuitOpenError:
+            print(f' [yellow]{required} {self.langchoice.dep_required_by} {required_by} : '
+                  f'{self.langchoice.moddb_down}, {self.langchoice.moddb_not_checked}[/yellow]')
+        except requests.exceptions.RequestException as err_url:
+            write_log(f'{err_url} : {dep_key}')
+        except Exception:
+            write_log(f'{dep_key}\n{traceback.format_exc()}')
+        return None
+
+    def update_mod(self, modinfo_values, modid_value, future_api, download_executor):
+        # Comparaison d'un mod à partir de la réponse de l'API et lancement du téléchargement si besoin
+        modname_value = modinfo_values[0]
+        self.version_locale = modinfo_values[2]
+        filename_value = modinfo_values[4]
+        try:
+            resp_dict = future_api.result()
+            if resp_dict['statuscode'] != '200':
+                write_log(f'Not Found : {modname_value}')
+                return
+            mod_asset_id = (resp_dict['mod']['assetid'])
+            releases = resp_dict['mod']['releases']
+            # Release la plus récente compatible, pas forcément releases[0]
+            selected = self.select_release(modinfo_values[1], releases)
+            release = selected[1] if selected is not None else releases[0]
+            self.mod_last_version_online = release['modversion']
+            # Réponse ancienne (moddb injoignable) : on signale les mods à mettre à jour sans les télécharger
+            stale_since = api_cache.stale_since(f'{self.url_api}{modid_value}')
+            # remote_version : release compatible retenue (None si aucune ne l'est)
+            self.manifest.set_mod(Path(filename_value).name, modname_value, modinfo_values[1],
+                                  self.version_locale, 'checked' if stale_since is None else 'stale',
+                                  release['modversion'] if selected is not None else None)
+            # compare les versions des mods
+            print(
+                f' [green]{modname_value[0].upper()}{modname_value[1:]}[/green]: {self.langchoice.compver1} : {self.version_locale} - {self.langchoice.compver2} : {self.mod_last_version_online}'
+                + (f' [yellow]({self.langchoice.moddb_stale})[/yellow]' if stale_since is not None else ''))
+            if selected is not None:
+                result_compversion_local = self.compversion_local(self.version_locale,
+                                                                  self.mod_last_version_online)  # (version locale, version online)
+                if stale_since is not None:
+                    if result_compversion_local == -1:
+                        self.mods_stale[modname_value] = (self.version_locale, self.mod_last_version_online,
+                                                          stale_since)
+                    return
+                if result_compversion_local == -1 or (
+                        result_compversion_local == 0 and self.force_update.lower() == 'true'):
+                    return self.start_download(modname_value, modinfo_values[1], self.version_locale, release,
+                                               filename_value, mod_asset_id, releases, download_executor)
+        except CircuitOpenError:
+            # moddb injoignable et aucune réponse connue pour ce mod (un seul message dans le log pour l'hôte)
+            self.mods_unreachable.append(modname_value)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.HTTPError) as err_url:
+            # moddb ne répond pas ou renvoie une erreur (5xx, 429) et aucune réponse connue pour ce mod
+            write_log(f'{err_url} : {modname_value}')
+            self.mods_unreachable.append(modname_value)
+        except requests.exceptions.RequestException as err_url:
+            # Affiche de l'erreur si le lien n'est pas valide
+            # print(f'[red]{LanguageChoice().error_msg}[/red]')  # debug
+            msg_error = f'{err_url} : {modname_value}'
+            write_log(msg_error)
+        except Exception:
+            msg = f'{modname_value}\n{traceback.format_exc()}'
+            write_log(msg)
+
+    def start_download(self, modname_value, modid, version_locale, release, old_filepath, mod_asset_id, releases,
+                       download_executor):
+        # Lancement du téléchargement d'une release (old_filepath : fichier à remplacer, None pour un nouveau mod)
+        version_online = release['modversion']
+        dl_link = make_dl_link(release['mainfile'], self.langchoice.url_cdn)
+        mod_file_name = release.get('filename') or \
+            urllib.parse.unquote(Path(urllib.parse.urlparse(dl_link).path).name)
+        new_filepath = Path(self.path_mods, Path(mod_file_name).name)
+        # On lance le téléchargement et on attend seulement les en-têtes pour afficher la taille
+        size_known = threading.Event()
+        download_size = {}
+
+        def set_size(size):
+            download_size['size'] = size
+            size_known.set()
+
+        mod_modidstr = release.get('modidstr') or modid
+        future_download = download_executor.submit(
+            self.get_release, str(dl_link), new_filepath, set_size,
+            mod_modidstr, version_online)
+        future_download.add_done_callback(lambda future: size_known.set())
+        size_known.wait()
+        if download_size.get('size') is not None:
+            file_size_mo = round(download_size['size'] / (1024 ** 2), 2)
+            print(
+                f'\t{self.langchoice.compver3} : {file_size_mo} {self.langchoice.compver3a}')
+        print(
+            f'\t[green] {modname_value} v.{version_online}[/green] {self.langchoice.compver4}')
+        print('\n')
+        return {
+            'modname': modname_value,
+            'modid': modid,
+            'version_locale': version_locale,
+            'version_online': version_online,
+            'asset_id': mod_asset_id,
+            'old_filepath': old_filepath,
+            'new_filepath': new_filepath,
+            'releases': releases,
+            'future': future_download
+        }
+
+    @staticmethod
+    def get_release(dl_link, new_filepath, on_size, modid, version):
+        # Release depuis le stockage local si un autre dossier de mods l'a déjà téléchargée, sinon depuis moddb
+        if release_store.install(modid, version, new_filepath, on_size):
+            return new_filepath
+        http_client.download(dl_link, new_filepath, on_size)
+        release_store.add(modid, version, new_filepath)
+        return new_filepath
+
+    def download_failed(self, download):
+        # Le mod installé n'est pas à jour : il sera vérifié de nouveau à la prochaine exécution
+        if download['old_filepath'] is not None:
+            self.manifest.set_mod(Path(download['old_filepath']).name, download['modname'], download['modid'],
+                                  download['version_locale'], 'error', download['version_online'])
+
+    def finish_download(self, download):
+        # Fin du téléchargement d'un mod : suppression de l'ancienne version et changelog
+        modname_value = download['modname']
+        try:
+            download['future'].result()
+        except Exception:
+            # L'ancienne version du mod est conservée
+            msg_error = f'{modname_value}\n{traceback.format_exc()}'
+            write_log(msg_error)
+            self.download_failed(download)
+            return False
+        # old_filepath vaut None pour un mod qui n'était pas installé (dépendance)
+        if download['old_filepath'] is not None and \
+                os.path.abspath(download['old_filepath']) != os.path.abspath(download['new_filepath']):
             try:
-                urllib.request.urlopen(req)  # On teste l'existence du lien
-                req_page = requests.get(str(mod_url_api), timeout=2)
-                resp_dict = req_page.json()
-                mod_asset_id = (resp_dict['mod']['assetid'])
-                self.mod_last_version_online = (
-                    resp_dict['mod']['releases'][0]['modversion'])
-                mod_file_onlinepath_raw = (resp_dict['mod']['releases'][0]['mainfile'])
-                mod_file_onlinepath = make_dl_link(mod_file_onlinepath_raw)
-                normalized_version = self.normalize_version(self.mod_last_version_online)
-                mod_prerelease_value = semver.Version.parse(normalized_version)
-                # compare les versions des mods
-                print(
-                    f' [green]{modname_value[0].upper()}{modname_value[1:]}[/green]: {LanguageChoice().compver1} : {self.version_locale} - {LanguageChoice().compver2} : {self.mod_last_version_online}')
-                if self.disable_mod_dev == 'false' or mod_prerelease_value.prerelease is None:
-                    # On récupère les version du jeu nécessaire pour le mod (cad la version la plus basse necessaire).
-                    mod_game_versions = resp_dict['mod']['releases'][0]['tags']
-                    first_min_ver = None
-                    for ver in mod_game_versions:
-                        first_min_ver = ver.split('v', 1)[1]
-                    result_compversion_local = self.compversion_local(
-                        self.normalize_version(self.version_locale),
-                        self.normalize_version(self.mod_last_version_online))  # (version locale, version online)
-                    # On compare la version max souhaité à la version necessaire pour le mod
-                    result_game_compare_version = self.compversion_first_min_version(
-                        self.gamever_limit,
-                        first_min_ver)  # (version locale, version online,)
-                    if result_game_compare_version == -1 or result_game_compare_version == 0:  # On met à jour
-                        if result_compversion_local == -1 or (
-                                result_compversion_local == 0 and self.force_update.lower() == 'true'):
-                            dl_link = f'{mod_file_onlinepath}'
-                            resp = requests.get(str(dl_link), stream=True, timeout=2,
-                                                allow_redirects=False)
-                            file_size = int(resp.headers.get("Content-length"))
-                            file_size_mo = round(file_size / (1024 ** 2), 2)
-                            print(
-                                f'\t{LanguageChoice().compver3} : {file_size_mo} {LanguageChoice().compver3a}')
-                            print(
-                                f'\t[green] {modname_value} v.{self.mod_last_version_online}[/green] {LanguageChoice().compver4}')
-                            try:
-                                os.remove(filename_value)
-                            except PermissionError:
-                                # print(f'[red]{LanguageChoice().error_msg}[/red]')  # debug
-                                msg_error = f'{filename_value} :\n\n\t {traceback.format_exc()}'
-                                write_log(msg_error)
-                                sys.exit()
-                            wget.download(dl_link, str(self.path_mods))
-                            self.Path_Changelog = f'https://mods.vintagestory.at/show/mod/{mod_asset_id}#tab-files'
-                            log_txt = self.get_changelog(
-                                self.Path_Changelog)  # On récupère le changelog
-                            content_lst_mods_updated = [
-                                self.version_locale,
-                                self.mod_last_version_online,
-                                log_txt
-                            ]
-                            self.mods_updated[modname_value] = content_lst_mods_updated
-                            print('\n')
-                            self.nb_maj += 1
-
-            except requests.exceptions.ReadTimeout:
-                write_log(
-                    'ReadTimeout error: Server did not respond within the specified timeout.')
-            except urllib.error.URLError as err_url:
-                # Affiche de l'erreur si le lien n'est pas valide
-                # print(f'[red]{LanguageChoice().error_msg}[/red]')  # debug
-                msg_error = f'{err_url.reason} : {modname_value}'
+                os.remove(download['old_filepath'])
+            except FileNotFoundError:
+                # Ancienne version déjà supprimée : la nouvelle est conservée
+                write_log(f'{download["old_filepath"]} :\n\n\t {traceback.format_exc()}')
+            except OSError:
+                # On ne garde pas deux versions du même mod
+                msg_error = f'{download["old_filepath"]} :\n\n\t {traceback.format_exc()}'
                 write_log(msg_error)
-            except Exception:
-                msg = f'{modname_value}\n{traceback.format_exc()}'
-                write_log(msg)
+                try:
+                    os.remove(download['new_filepath'])
+                except OSError:
+                    write_log(f'{download["new_filepath"]} :\n\n\t {traceback.format_exc()}')
+                self.download_failed(download)
+                return False
+        self.Path_Changelog = f'{self.langchoice.url_mods}show/mod/{download["asset_id"]}#tab-files'
+        # Changelogs depuis la réponse de l'API déjà obtenue
+        log_txt = self.get_changelog_api(download['releases'], download['version_locale'],
+                                         download['version_online'], self.Path_Changelog)
+        if log_txt is None:
+            # Sinon page du mod, mise en cache pour cette version du mod
+            changelog_key = f'{self.Path_Changelog}@{download["version_online"]}'
+            if changelog_key not in VSUpdate.shared_changelogs:
+                log_txt = api_cache.get_cached_json(changelog_key)
+                if log_txt is None:
+                    log_txt = self.get_changelog(self.Path_Changelog)  # On récupère le changelog
+                    if log_txt:
+                        api_cache.write({'url': changelog_key, 'fetched': time.time(), 'etag': None,
+                                         'last_modified': None, 'body': log_txt})
+                VSUpdate.shared_changelogs[changelog_key] = log_txt
+            log_txt = VSUpdate.shared_changelogs[changelog_key]
+        content_lst_mods_updated = [
+            download['version_locale'],
+            download['version_online'],
+            log_txt
+        ]
+        self.mods_updated[modname_value] = content_lst_mods_updated
+        self.nb_maj += 1
+        # Le manifest suit le nouveau fichier du mod
+        if download['old_filepath'] is not None:
+            self.manifest.remove_mod(Path(download['old_filepath']).name)
+        self.manifest.set_mod(Path(download['new_filepath']).name, modname_value, download['modid'],
+                              download['version_online'], 'checked', download['version_online'])
+        return True
+
+    def log_filename(self):
+        log_date = dt.datetime.today().strftime("%Y%m%d_%H%M%S")
+        if self.instance is None:
+            return f'updates_{log_date}.txt'
+        # Un fichier log par dossier de mods
+        instance_name = re.sub(r'\W+', '_', f'{self.path_mods.parent.name}_{self.path_mods.name}').strip('_')
+        return f'updates_{instance_name}_{log_date}.txt'
 
     def resume(self):
         # Résumé de la maj
         if self.nb_maj > 1:
-            print(f'  [yellow]{LanguageChoice().summary1}[/yellow] \n')
-            print(f'{LanguageChoice().summary2} :')
-            log_filename = f'updates_{dt.datetime.today().strftime("%Y%m%d_%H%M%S")}.txt'
+            print(f'  [yellow]{self.langchoice.summary1}[/yellow] \n')
+            print(f'{self.langchoice.summary2} :')
+            log_filename = self.log_filename()
             if not self.path_logs.is_dir():
                 os.mkdir('logs')
             log_path = Path(self.path_logs, log_filename)
             with open(log_path, 'w', encoding='utf-8-sig') as logfile:
                 logfile.write(
-                    f'\n\t\t\tMods Vintage Story - {LanguageChoice().last_update} : {dt.datetime.today().strftime("%Y-%m-%d %H:%M:%S")}\n\n')
+                    f'\n\t\t\tMods Vintage Story - {self.langchoice.last_update} : {dt.datetime.today().strftime("%Y-%m-%d %H:%M:%S")}\n\n')
                 for modname, value in self.mods_updated.items():
                     local_version = value[0]
                     online_last_version = value[1]
@@ -827,15 +2555,15 @@ class VSUpdate:
                                 logfile.write(f'\t\t- {line}\n')
 
         elif self.nb_maj == 1:
-            print(f'  [yellow]{LanguageChoice().summary3}[/yellow] \n')
-            print(f'{LanguageChoice().summary4} :')
-            log_filename = f'updates_{dt.datetime.today().strftime("%Y%m%d_%H%M%S")}.txt'
+            print(f'  [yellow]{self.langchoice.summary3}[/yellow] \n')
+            print(f'{self.langchoice.summary4} :')
+            log_filename = self.log_filename()
             if not self.path_logs.is_dir():
                 os.mkdir('logs')
             log_path = Path(self.path_logs, log_filename)
             with open(log_path, 'w', encoding='utf-8-sig') as logfile:
                 logfile.write(
-                    f'\n\t\t\tMods Vintage Story - {LanguageChoice().last_update} : {dt.datetime.today().strftime("%Y-%m-%d %H:%M:%S")}\n\n')
+                    f'\n\t\t\tMods Vintage Story - {self.langchoice.last_update} : {dt.datetime.today().strftime("%Y-%m-%d %H:%M:%S")}\n\n')
                 for modname, value in self.mods_updated.items():
                     local_version = value[0]
                     online_last_version = value[1]
@@ -851,115 +2579,119 @@ class VSUpdate:
                                 print(f'\t\t[yellow]- {line}[/yellow]')
                                 logfile.write(f'\t\t- {line}\n')
         else:
-            print(f'  [yellow]{LanguageChoice().summary5}[/yellow]\n')
+            print(f'  [yellow]{self.langchoice.summary5}[/yellow]\n')
+
+        # moddb injoignable : mods à mettre à jour d'après la dernière réponse connue (non téléchargés)
+        if self.mods_stale:
+            print(f'\n [yellow]{self.langchoice.moddb_down}. {self.langchoice.moddb_stale_list} :[/yellow]')
+            for modname, (local_version, online_version, stale_since) in self.mods_stale.items():
+                stale_date = dt.datetime.fromtimestamp(stale_since).strftime("%Y-%m-%d %H:%M")
+                print(f' - [yellow]{modname} : v.{local_version} -> v.{online_version} [italic]({self.langchoice.moddb_stale_from} {stale_date})[/italic][/yellow]')
+        if self.mods_unreachable:
+            print(f'\n [red]{self.langchoice.moddb_down}. {self.langchoice.moddb_unreachable_list} : {len(self.mods_unreachable)}[/red]')
+            for modname in self.mods_unreachable:
+                print(f' - [red]{modname}[/red]')
 
         if len(self.mods_exclu) == 1:
-            modinfo_values = self.extract_modinfo(self.mods_exclu[0])
+            modinfo_values = self.modinfo(self.mods_exclu[0])
             print(
-                f'\n {LanguageChoice().summary6} :\n - [red]{modinfo_values[0]} [italic](v.{modinfo_values[2]})[italic][/red]')
+                f'\n {self.langchoice.summary6} :\n - [red]{modinfo_values[0]} [italic](v.{modinfo_values[2]})[italic][/red]')
         if len(self.mods_exclu) > 1:
-            print(f'\n {LanguageChoice().summary7} :')
+            print(f'\n {self.langchoice.summary7} :')
             for k in range(0, len(self.mods_exclu)):
                 # On appelle la fonction pour extraire modinfo.json
-                modinfo_values = self.extract_modinfo(self.mods_exclu[k])
+                modinfo_values = self.modinfo(self.mods_exclu[k])
                 print(f' - [red]{modinfo_values[0]} v.{modinfo_values[2]}[/red]')
 
 
 # Création du pdf.
+class ModsListBuilder:
+    # Liste des mods pour le pdf, construite en parallèle : infos de l'index des modinfo (déjà construit par la maj),
+    # vérification et icône en une seule ouverture de chaque archive, url depuis le catalogue ou le cache de l'API.
+    def __init__(self, vsupdate):
+        self.vsupdate = vsupdate
+
+    def mod_row(self, filename):
+        modinfo_values = self.vsupdate.modinfo(filename)
+        if modinfo_values[0] is None:
+            return None
+        return GetInfo(modinfo_values[0], modinfo_values[1], modinfo_values[3], modinfo_values[4],
+                       self.vsupdate.langchoice).get_infos()
+
+    def build(self):
+        # Lignes du pdf (nom, description, url, icône) dans l'ordre alphabétique des fichiers
+        filenames = sorted((elem.name for elem in self.vsupdate.path_mods.glob('*.zip')), key=str.casefold)
+        rows = [None] * len(filenames)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.vsupdate.workers) as executor:
+            futures = {executor.submit(self.mod_row, filename): num for num, filename in enumerate(filenames)}
+            for nb_mods_ok, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                rows[futures[future]] = future.result()
+                print(f'\t\t{self.vsupdate.langchoice.addingmodsinprogress} {nb_mods_ok}/{len(filenames)}', end="\r")
+        self.vsupdate.modinfo_index.save()
+        return [row for row in rows if row is not None]
+
+
 class GetInfo:
-    def __init__(self, mod_name, mod_id, mod_moddesc, mod_filepath):
+    def __init__(self, mod_name, mod_id, mod_moddesc, mod_filepath, langchoice):
+        self.langchoice = langchoice
         # path
         self.filepath = mod_filepath
-        self.path_temp = 'temp'
-        self.path_png = Path('temp', 'png')
         self.path_modicon = None
-        self.path_url = 'https://mods.vintagestory.at/'
-        self.api_url = 'https://mods.vintagestory.at/api/mod/'
-        # dico
-        self.modsinfo_dic = {}
-        # list
-        self.moddesc_lst = []
+        self.api_url = f'{self.langchoice.url_mods}api/mod/'
         # var
         self.mod_moddesc = mod_moddesc
         self.mod_name = mod_name
         self.mod_url = None
         self.mod_id = mod_id
-        self.modinfo_content = None
         self.test_url_mod = ''
-        # var temps
-        self.current_dateTime = datetime.now()
-        self.date_dl = self.current_dateTime.strftime("%Y-%m-%d %H:%M")
-        self.annee = self.current_dateTime.strftime("%Y")
-        self.mois = self.current_dateTime.strftime("%m")
-        self.jour = self.current_dateTime.strftime("%d")
-        # path
-        os.makedirs('Modslist', exist_ok=True)
-        modslist_basename = f'modslist_{self.annee}_{self.mois}_{self.jour}.csv'
-        self.csvfile = Path('Modslist', modslist_basename)
-        self.csv_temp_file = Path('temp', 'csvtemp.csv')
 
     def get_infos(self):
-        # Vérifier la validité du fichier ZIP avec la méthode statique
-        if VSUpdate.test_zip_validity(self.filepath):
-            # extraction modicon.png et renommage avec modid
-            if zipfile.is_zipfile(self.filepath):
-                archive = zipfile.ZipFile(self.filepath, 'r')
-                try:
-                    archive.extract('modicon.png', self.path_png)
-                    png_name = f'{self.mod_id}.png'
-                    self.path_modicon = Path(self.path_png, png_name)
-                    try:
-                        os.rename(Path(self.path_png, 'modicon.png'), self.path_modicon)
-                    except FileExistsError:
-                        pass
-                except KeyError:
-                    pass
-                zipfile.ZipFile.close(archive)
-            if self.get_url(self.mod_id) is None:
+        # Vérifier la validité du fichier ZIP (si pas déjà vérifié) et lire modicon.png en une seule ouverture
+        record = VSUpdate.scan_zip(self.filepath, read_modinfo=False, read_icon=True)
+        if record is not None:
+            # miniature de modicon.png (lu en mémoire, réduit une seule fois)
+            if record['icon'] is not None:
+                self.path_modicon = icon_cache.thumbnail(record['icon'])
+            self.mod_url = self.get_url(self.mod_id)
+            if self.mod_url is None:
                 self.mod_url = "Not on modDB"
-            else:
-                self.mod_url = self.get_url(self.mod_id)
-            self.moddesc_lst.append(self.mod_moddesc)
-            self.moddesc_lst.append(self.mod_url)
-            self.moddesc_lst.append(self.path_modicon)
-            self.modsinfo_dic[self.mod_name] = self.moddesc_lst
-            # On crée le csv
-            with open(self.csv_temp_file, "a", encoding="UTF-8", newline='') as fichier:
-                objet_csv = csv.writer(fichier)
-                for items in self.modsinfo_dic:
-                    objet_csv.writerow(
-                        [items, self.modsinfo_dic[items][0], self.modsinfo_dic[items][1],
-                         self.modsinfo_dic[items][2]])
-            return self.modsinfo_dic
+            # Ligne du pdf : nom, description, url, icône
+            return [self.mod_name, self.mod_moddesc, self.mod_url,
+                    str(self.path_modicon) if self.path_modicon is not None else None]
         else:
             # print(f"[red]Le fichier ZIP {self.filepath} est invalide ou corrompu.[/red]") #  intutile car info pour pdf seulement
             return None
 
     def get_url(self, modid):
+        # Catalogue de moddb déjà chargé (bulk_lookup) : pas de requête
+        if VSUpdate.shared_catalogue is not None and str(modid).lower() in VSUpdate.shared_catalogue:
+            entry = VSUpdate.shared_catalogue[str(modid).lower()]
+            if entry.get('urlalias'):
+                return f'{self.langchoice.url_mods}{entry["urlalias"]}'
+            return f'{self.langchoice.url_mods}show/mod/{entry["assetid"]}'
         url = os.path.join(self.api_url, modid)
         try:
-            req_page = requests.get(url, timeout=2)
-            resp_dict = req_page.json()
+            resp_dict = api_cache.get_json(url, timeout=2)
             mod_asset_id = str(
                 resp_dict.get('mod', {}).get('assetid', 'Local Mod'))
             mod_urlalias = str(
                 resp_dict.get('mod', {}).get('urlalias', 'Local'))
             if mod_urlalias == 'None':
-                self.test_url_mod = f'https://mods.vintagestory.at/show/mod/{mod_asset_id}'
+                self.test_url_mod = f'{self.langchoice.url_mods}show/mod/{mod_asset_id}'
             elif mod_urlalias == 'Local':
                 self.test_url_mod = ""
             else:
-                self.test_url_mod = f'https://mods.vintagestory.at/{mod_urlalias}'
+                self.test_url_mod = f'{self.langchoice.url_mods}{mod_urlalias}'
             return self.test_url_mod
         except requests.exceptions.ReadTimeout:
             write_log(
                 'ReadTimeout error: Server did not respond within the specified timeout.')
-        except urllib.error.HTTPError:
+        except requests.exceptions.HTTPError:
             return None
-        except urllib.error.URLError as err_url:
+        except requests.exceptions.RequestException as err_url:
             # Affiche de l'erreur si le lien n'est pas valide
             # # print(f'[red]{LanguageChoice().error_msg}[/red]')  # debug
-            msg_error = f'{err_url.reason} : {self.test_url_mod}'
+            msg_error = f'{err_url} : {self.test_url_mod}'
             write_log(msg_error)
         except KeyError:
             # # print(f'[red]{LanguageChoice().error_msg}[/red]')  # debug
@@ -968,19 +2700,154 @@ class GetInfo:
             sys.exit()
 
 
+class ModsListExport:
+    # Export de la liste des mods (JSON Lines, CSV ou page HTML) pour les outils de suivi.
+    # Les mods sont lus un par un (générateur) depuis le manifest et l'index des modinfo de l'exécution :
+    # aucune archive rouverte, aucune requête, mémoire constante.
+    fields = ['folder', 'file', 'name', 'modid', 'version', 'latest_version', 'status', 'url', 'description',
+              'dependencies', 'size', 'modified']
+
+    def __init__(self, export_format, langchoice, export_file=None, stdout=None):
+        self.export_format = export_format
+        self.langchoice = langchoice
+        self.stdout = stdout if stdout is not None else sys.stdout  # flux utilisé pour export_file '-'
+        if export_file is None:
+            date_export = datetime.now().strftime('%Y_%m_%d')
+            export_file = Path('Modslist', f'modslist_{date_export}.{export_format}')
+        self.export_file = export_file  # '-' : sortie standard
+
+    @staticmethod
+    def cached_url(modid, url_mods):
+        # Url du mod depuis le catalogue ou la dernière réponse de l'API en cache (pas de requête)
+        if VSUpdate.shared_catalogue is not None and str(modid).lower() in VSUpdate.shared_catalogue:
+            entry = VSUpdate.shared_catalogue[str(modid).lower()]
+        else:
+            resp_dict = api_cache.get_cached_json(f'{url_mods}api/mod/{modid}')
+            if resp_dict is None or resp_dict.get('statuscode') != '200':
+                return None
+            entry = resp_dict['mod']
+        if entry.get('urlalias'):
+            return f'{url_mods}{entry["urlalias"]}'
+        return f'{url_mods}show/mod/{entry["assetid"]}'
+
+    @staticmethod
+    def records(vsupdate):
+        # Un enregistrement par fichier de mod du dossier, dans l'ordre alphabétique
+        manifest_mods = vsupdate.manifest.load().get('mods', {})
+        for filename in sorted(manifest_mods, key=str.casefold):
+            entry = manifest_mods[filename]
+            description = None
+            dependencies = {}
+            if entry.get('modid'):
+                modinfo_values = vsupdate.modinfo(filename)
+                description = modinfo_values[3]
+                dependencies = modinfo_values[5]
+            yield {
+                'folder': str(vsupdate.path_mods),
+                'file': filename,
+                'name': entry.get('name'),
+                'modid': entry.get('modid'),
+                'version': entry.get('version'),
+                'latest_version': entry.get('remote_version'),
+                'status': entry.get('status'),
+                'url': ModsListExport.cached_url(entry['modid'], vsupdate.langchoice.url_mods)
+                if entry.get('modid') else None,
+                'description': description,
+                'dependencies': dependencies,
+                'size': entry.get('size'),
+                'modified': dt.datetime.fromtimestamp(entry['mtime'] / 1e9).isoformat(timespec='seconds')
+                if entry.get('mtime') else None
+            }
+
+    def write_jsonl(self, records, out):
+        nb_records = 0
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            nb_records += 1
+        return nb_records
+
+    def write_csv(self, records, out):
+        writer = csv.DictWriter(out, fieldnames=self.fields)
+        writer.writeheader()
+        nb_records = 0
+        for record in records:
+            record['dependencies'] = ' '.join(f'{modid}@{version}' if version else modid
+                                              for modid, version in record['dependencies'].items())
+            writer.writerow(record)
+            nb_records += 1
+        return nb_records
+
+    def write_html(self, records, out):
+        out.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                  f'<title>Vintage Story mods - {datetime.now().strftime("%Y-%m-%d %H:%M")}</title>\n'
+                  '<style>body{font-family:sans-serif}table{border-collapse:collapse}'
+                  'td,th{border:1px solid #999;padding:2px 6px;text-align:left}</style>\n'
+                  '</head>\n<body>\n<table>\n<tr>')
+        out.write(''.join(f'<th>{field}</th>' for field in self.fields) + '</tr>\n')
+        nb_records = 0
+        for record in records:
+            cells = []
+            for field in self.fields:
+                value = record[field]
+                if field == 'dependencies':
+                    value = ', '.join(f'{modid} {version}'.strip() for modid, version in value.items())
+                value = html.escape('' if value is None else str(value))
+                if field == 'name' and record['url']:
+                    value = f'<a href="{html.escape(record["url"])}">{value}</a>'
+                cells.append(f'<td>{value}</td>')
+            out.write('<tr>' + ''.join(cells) + '</tr>\n')
+            nb_records += 1
+        out.write('</table>\n</body>\n</html>\n')
+        return nb_records
+
+    def export(self, vsupdate_list):
+        records = (record for vsupdate in vsupdate_list for record in self.records(vsupdate))
+        writer = getattr(self, f'write_{self.export_format}')
+        if str(self.export_file) == '-':
+            nb_records = writer(records, self.stdout)
+            self.stdout.flush()
+            return nb_records
+        export_path = Path(self.export_file)
+        export_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = export_path.with_name(f'{export_path.name}.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+                nb_records = writer(records, out)
+            os.replace(tmp_path, export_path)
+        except OSError:
+            write_log(traceback.format_exc())
+            return None
+        print(f'\n[blue]{self.langchoice.export_done} : {export_path} ({nb_records} {self.langchoice.export_mods})[/blue]')
+        return nb_records
+
+
 class MakePdf:
-    def __init__(self):
-        self.langchoice = LanguageChoice()
+    # Tableau des mods : largeur (mm) et largeur des colonnes (icône, nom, description)
+    table_width = 190
+    col_widths = (5, 55, 130)
+    # Résolution des icônes à l'impression
+    icon_dpi = 300
+
+    @classmethod
+    def icon_size(cls):
+        # Taille en pixels de l'icône dans sa cellule
+        icon_width_mm = cls.table_width * cls.col_widths[0] / sum(cls.col_widths)
+        return round(icon_width_mm / 25.4 * cls.icon_dpi)
+
+    def __init__(self, table_data, langchoice):
+        self.langchoice = langchoice
+        # Lignes du tableau (nom, description, url, icône) fournies par ModsListBuilder
+        self.table_data = table_data
         # var temps
         self.current_dateTime = datetime.now()
         self.date_dl = self.current_dateTime.strftime("%Y-%m-%d %H:%M")
         self.annee = self.current_dateTime.strftime("%Y")
         self.mois = self.current_dateTime.strftime("%m")
         self.jour = self.current_dateTime.strftime("%d")
-        # path
-        self.csv_temp_file = Path('temp', 'csvtemp.csv')
 
     def makepdf(self):
+        # fpdf2 n'est chargé que pour le pdf
+        from fpdf import FPDF, YPos, XPos
         try:
             # On crée le pdf
             monpdf = FPDF('P', 'mm', 'A4')
@@ -993,6 +2860,7 @@ class MakePdf:
             monpdf.add_page(same=True)
             os.makedirs('Modslist', exist_ok=True)
             nom_fichier_pdf = f'VS_Mods_{self.annee}_{self.mois}_{self.jour}.pdf'
+            # Réduction de la bannière (les icônes sont déjà à la taille de leur cellule)
             monpdf.oversized_images = "DOWNSCALE"
             monpdf.oversized_images_ratio = 5
             width_img = 180
@@ -1004,17 +2872,11 @@ class MakePdf:
             monpdf.set_y(45)
             monpdf.cell(w=0, h=20, text=f'{self.langchoice.pdfTitle}', border=0,
                         new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C", fill=False)
-            table_data = []
-            # On remplit la liste table_data
-            with open(self.csv_temp_file, newline='', encoding="utf-8", errors="replace") as csv_file:
-                reader = csv.reader(csv_file, delimiter=',')
-                for ligne in reader:
-                    table_data.append(ligne)
             with monpdf.table(first_row_as_headings=False,
                               line_height=5,
-                              width=190,
-                              col_widths=(5, 55, 130)) as table:
-                for ligne in table_data:
+                              width=self.table_width,
+                              col_widths=self.col_widths) as table:
+                for ligne in self.table_data:
                     # cellule 1 - icone
                     row = table.row()
                     row.cell(img=ligne[3], img_fill_width=True, link=ligne[2])
@@ -1033,9 +2895,9 @@ class MakePdf:
         try:
             pdf_file_path = Path('Modslist', nom_fichier_pdf)
             monpdf.output(pdf_file_path)
-            print(f'\n\n\t\t[blue]{lang.makingpdfended}\n[/blue]')
+            print(f'\n\n\t\t[blue]{self.langchoice.makingpdfended}\n[/blue]')
         except PermissionError:
-            print(f'[red]{lang.ErrorCreationPDF}[/red]')
+            print(f'[red]{self.langchoice.ErrorCreationPDF}[/red]')
 
 
 # On récupère le system
@@ -1066,16 +2928,36 @@ argParser.add_argument("--makepdf",
 argParser.add_argument("--disable_mod_dev",
                        help="enable or disable the update of mods in dev or prerelease (true/false default=false)",
                        choices=['false', 'true'], type=str.lower, required=False)
-args = argParser.parse_args()
-# Fin des arguments
-
-# Test si il existe un fichier langue. (english par defaut)
-try:
-    lang = LanguageChoice()
-except Exception:
-    traceback_info = traceback.format_exc()
-    write_log(traceback_info)
-    sys.exit()
+argParser.add_argument("--instances",
+                       help="Update several mods directories (in quotes, separated by space) in one run.",
+                       nargs="+", type=pathlib.Path)
+argParser.add_argument("--workers",
+                       help="Number of mods checked simultaneously on moddb (default=8).",
+                       type=int, required=False)
+argParser.add_argument("--bulk",
+                       help="Get the list of all moddb mods in one request instead of one request per mod (default=false).",
+                       choices=['false', 'true'], type=str.lower, required=False)
+argParser.add_argument("--deep-verify",
+                       help="Check the CRC of every file of every mod archive, even if already checked (default=false).",
+                       choices=['false', 'true'], type=str.lower, required=False,
+                       default='false')
+argParser.add_argument("--export",
+                       help="At the end of the run, write the list of the mods in JSON Lines, CSV or HTML format.",
+                       choices=['jsonl', 'csv', 'html'], type=str.lower, required=False)
+argParser.add_argument("--export-file",
+                       help="File of the --export list (default=Modslist/modslist_YYYY_MM_DD.<format>, - for the standard output, console messages then go to the standard error).",
+                       required=False)
+argParser.add_argument("--debug",
+                       help="Show the startup time of the script (default=false).",
+                       choices=['false', 'true'], type=str.lower, required=False,
+                       default='false')
+argParser.add_argument("--profile",
+                       help="Time each step of the run and the requests, report in the logs folder (pstats: also a cProfile file) (default=false).",
+                       choices=['false', 'true', 'pstats'], type=str.lower, required=False,
+                       default='false')
+argParser.add_argument("--cache",
+                       help="Show (info) or empty (purge) the cache of moddb responses and downloaded mods, then exit.",
+                       choices=['info', 'purge'], type=str.lower, required=False)
 
 
 def datapath():
@@ -1085,9 +2967,9 @@ def datapath():
 
 
 # On récupère l'argument modspath
-def arg_modspath():
+def arg_modspath(modspath=None):
     # On vérifie si le chemin contient des variables d'environnement
-    path_mods_raw = Path(args.modspath)
+    path_mods_raw = Path(modspath if modspath is not None else args.modspath)
     # On vérifie si la variable %appdata% (ou HOME) est dans le chemin et on la remplace par la variable systeme.
     if my_os == 'Windows':
         regex_path_mods = r'(%APPDATA%)(.*)'
@@ -1109,97 +2991,227 @@ def arg_modspath():
     return arg_path_mods
 
 
-# On récupère le dossier des mods par argument, sinon on definit par defaut
-if args.modspath:
-    path_mods = arg_modspath()
-else:
-    if my_os == 'Windows':
-        # On cherche les versions installées de Vintage Story
-        path_mods = Path(os.getenv('appdata'), 'VintagestoryData', 'Mods')
-    elif my_os == 'Linux':
-        path_mods = Path(Path.home(), '.config', 'VintagestoryData', 'Mods')
-    else:
-        path_mods = None
-
-# Charge le chemin du dossier data de VS à partir du config.ini si il exsite
-config_path = Path(Path.cwd(), 'config.ini')
-config_make_pdf = None
-if not Path(config_path).is_file():
-    if not args.modspath:
-        while not path_mods.is_dir():
-            path_mods = datapath()
-else:
-    # On charge le fichier config.ini si --modspath non donné
-    if not args.modspath:
-        config_read = configparser.ConfigParser(allow_no_value=True, interpolation=None)
-        config_read.read('config.ini', encoding='utf-8-sig')
-        config_path = config_read.get('ModPath', 'path')
-        path_mods = Path(config_path)
-    else:
+# Liste des dossiers de mods pour le mode multi-dossiers (--instances, sinon section [Instances] du config.ini)
+def instances_paths():
+    if args.instances:
+        return [arg_modspath(instance_path) for instance_path in args.instances]
+    config_instances = lang.config_read
+    if not config_instances.has_section('Instances'):
+        return []
+    return [arg_modspath(instance_path) for key, instance_path in config_instances.items('Instances')
+            if instance_path and key not in config_instances.defaults()]
+
+
+if __name__ == '__main__':
+    # Nécessaire pour les processus de l'analyse parallèle des mods (exécutable Windows)
+    multiprocessing.freeze_support()
+
+    args = argParser.parse_args()
+    # Fin des arguments
+
+    # Export sur la sortie standard : les messages de la console passent sur la sortie d'erreur
+    export_stdout = sys.stdout
+    if args.export and args.export_file == '-':
+        sys.stdout = sys.stderr
+
+    # Contexte partagé : config.ini et fichier de langue lus une seule fois.
+    # Test si il existe un fichier langue. (english par defaut)
+    try:
+        lang = LanguageChoice()
+        lang.catalog  # noqa: B018
+    except Exception:
+        traceback_info = traceback.format_exc()
+        write_log(traceback_info)
+        sys.exit()
+
+    # Client http partagé (sessions keep-alive par hôte, débit limité par hôte dans config.ini)
+    try:
+        rate_limit = lang.config_read.getfloat('ModsUpdater', 'rate_limit', fallback=20)
+    except ValueError:
+        write_log('Error in config.ini [ModsUpdater] - rate_limit : number expected')
+        rate_limit = 20
+    try:
+        max_retries = max(0, lang.config_read.getint('ModsUpdater', 'max_retries', fallback=3))
+    except ValueError:
+        write_log('Error in config.ini [ModsUpdater] - max_retries : integer expected')
+        max_retries = 3
+    http_client = HttpClient(rate_limit=rate_limit, retries=max_retries)
+    # Mesures de l'exécution (--profile)
+    profiler = RunProfiler(args.profile)
+
+    # Cache des réponses de l'API (ttl en minutes dans config.ini)
+    config_cache = lang.config_read
+    try:
+        api_cache_ttl = config_cache.getint('Cache', 'api_ttl', fallback=60)
+    except ValueError:
+        write_log('Error in config.ini [Cache] - api_ttl : integer expected')
+        api_cache_ttl = 60
+    api_cache = ApiCache(Path('cache', 'api'), api_cache_ttl * 60)
+    # Stockage des fichiers téléchargés, partagé entre dossiers de mods (taille max en Mo dans config.ini)
+    try:
+        store_max_size = config_cache.getint('Cache', 'store_max_size', fallback=1024)
+    except ValueError:
+        write_log('Error in config.ini [Cache] - store_max_size : integer expected')
+        store_max_size = 1024
+    release_store = ReleaseStore(config_cache.get('Cache', 'store_path', fallback=str(Path('cache', 'store'))),
+                                 store_max_size * 1024 ** 2)
+    # Cache des archives déjà vérifiées
+    zip_validation = ZipValidationCache(Path('cache', 'zip_validation.json'),
+                                        config_cache.get('ModsUpdater', 'zip_check', fallback='full').lower(),
+                                        args.deep_verify == 'true',
+                                        config_cache.get('ModsUpdater', 'zip_check_hash', fallback='false').lower() == 'true')
+    # Miniatures des icônes pour le pdf
+    icon_cache = IconCache(Path('cache', 'icons'), MakePdf.icon_size())
+    if args.cache == 'info':
+        api_cache.info(lang)
+        release_store.info(lang)
+        icon_cache.info(lang)
+        sys.exit()
+    elif args.cache == 'purge':
+        api_cache.purge(lang)
+        release_store.purge(lang)
+        icon_cache.purge(lang)
+        sys.exit()
+
+    # Vérification d'une nouvelle version du script en arrière-plan (hors du chemin critique)
+    maj_script = MajScript()
+    maj_script.start()
+    if args.debug == 'true':
+        startup_end = time.perf_counter()
+        print(f'[bold]Startup time : {(startup_end - startup_start) * 1000:.1f} ms (after the imports)[/bold]')
+
+
+    # On récupère le dossier des mods par argument, sinon on definit par defaut
+    if args.modspath:
         path_mods = arg_modspath()
-
-if path_mods.is_dir():
-    inst = VSUpdate(path_mods)
-    inst.accueil()
-    inst.mods_exclusion()
-    inst.mods_list()
-    inst.update_mods()
-    inst.resume()
-
-# Création du pdf (si argument nopause est false)
-if args.nopause == 'false' or args.makepdf == 'true':
-    make_pdf = None
-    if args.makepdf == 'false':
-        while make_pdf not in {str(LanguageChoice().yes).lower(),
-                               str(LanguageChoice().yes[0]).lower(),
-                               str(LanguageChoice().no).lower(),
-                               str(LanguageChoice().no[0]).lower()}:
-            make_pdf = Prompt.ask(f'{LanguageChoice().makepdf}',
-                                  choices=[LanguageChoice().list_yesno[0],
-                                           LanguageChoice().list_yesno[1],
-                                           LanguageChoice().list_yesno[2],
-                                           LanguageChoice().list_yesno[3]])
     else:
-        make_pdf = str(LanguageChoice().yes).lower()
-    if make_pdf == str(LanguageChoice().yes).lower() or make_pdf == str(
-            LanguageChoice().yes[0]).lower():
-        # Construction du titre
-        asterisk = '*'
-        nb_asterisk = len(LanguageChoice().makePDFTitle) + 4
-        string_asterisk = asterisk * nb_asterisk
-        print(f'\t[green]{string_asterisk}[/green]')
-        print(f'\t[green]* {LanguageChoice().makePDFTitle} *[/green]')
-        print(f'\t[green]{string_asterisk}[/green]')
-
-        # uniquement pour avoir le nb de mods (plus rapide car juste listing)
-        nb_mods = 0
-        nb_mods_ok = 0
-        print('\n')
-        mod_file_path = Path(path_mods, '*.*')
-        for mod in glob.glob(str(mod_file_path)):
-            if os.path.splitext(mod)[1] == '.zip' or os.path.splitext(mod)[1] == '.cs':
-                nb_mods += 1
-        for modfilepath in glob.glob(str(mod_file_path)):
-            if os.path.splitext(modfilepath)[1] == '.zip' or \
-                    os.path.splitext(modfilepath)[1] == '.cs':
-                nb_mods_ok += 1
-                info_content = VSUpdate(modfilepath).extract_modinfo(modfilepath)
-                GetInfo(info_content[0], info_content[1], info_content[3],
-                        info_content[4]).get_infos()
-                print(
-                    f'\t\t{LanguageChoice().addingmodsinprogress} {nb_mods_ok}/{nb_mods}',
-                    end="\r")
-
-        pdf = MakePdf()  # Passer directement les données à MakePdf
-        pdf.makepdf()
-
+        if my_os == 'Windows':
+            # On cherche les versions installées de Vintage Story
+            path_mods = Path(os.getenv('appdata'), 'VintagestoryData', 'Mods')
+        elif my_os == 'Linux':
+            path_mods = Path(Path.home(), '.config', 'VintagestoryData', 'Mods')
+        else:
+            path_mods = None
+
+    # Charge le chemin du dossier data de VS à partir du config.ini si il exsite
+    config_path = Path(Path.cwd(), 'config.ini')
+    config_make_pdf = None
+    list_instances = instances_paths()
+    if not Path(config_path).is_file():
+        if not args.modspath and not list_instances:
+            while not path_mods.is_dir():
+                path_mods = datapath()
+    else:
+        # On charge le fichier config.ini si --modspath non donné
+        if not args.modspath:
+            config_path = lang.config_read.get('ModPath', 'path')
+            path_mods = Path(config_path)
+        else:
+            path_mods = arg_modspath()
+
+    inst = None
+    list_done = []
+    if list_instances:
+        # Mode multi-dossiers : les infos de moddb, le catalogue, les changelogs et les fichiers téléchargés sont partagés
+        accueil_done = False
+        for instance_path in list_instances:
+            if not instance_path.is_dir():
+                msg_error = f'{lang.err_folder_instance} : {instance_path}'
+                print(f'[red]{msg_error}[/red]')
+                write_log(msg_error)
+                continue
+            if not RunManifest.folder_state(instance_path):
+                # Dossier sans mods : on passe au suivant
+                print(f'[red]{lang.err_list_instance} : {instance_path}[/red]')
+                write_log(f'{lang.err_list_instance} : {instance_path}')
+                continue
+            with profiler.phase('init', instance_path):
+                inst = VSUpdate(instance_path, lang, instance=instance_path)
+            # Accueil avant le premier dossier traité
+            if not accueil_done:
+                with profiler.phase('accueil', instance_path):
+                    inst.accueil()
+                accueil_done = True
+            print(f'\n[bold cyan]{instance_path}[/bold cyan]\n')
+            with profiler.phase('mods_exclusion', instance_path):
+                inst.mods_exclusion()
+            with profiler.phase('mods_list', instance_path):
+                inst.mods_list()
+            if not inst.mod_filename and not inst.up_to_date:
+                continue  # aucun mod valide dans ce dossier
+            with profiler.phase('update_mods', instance_path):
+                inst.update_mods()
+            with profiler.phase('resume', instance_path):
+                inst.resume()
+            list_done.append(inst)
+    elif path_mods.is_dir():
+        with profiler.phase('init', path_mods):
+            inst = VSUpdate(path_mods, lang)
+        with profiler.phase('accueil', path_mods):
+            inst.accueil()
+        with profiler.phase('mods_exclusion', path_mods):
+            inst.mods_exclusion()
+        with profiler.phase('mods_list', path_mods):
+            inst.mods_list()
+        with profiler.phase('update_mods', path_mods):
+            inst.update_mods()
+        with profiler.phase('resume', path_mods):
+            inst.resume()
+        list_done.append(inst)
+
+    # Nouvelle version du script (si pas encore affichée à l'accueil)
+    maj_script.show()
+
+    # Export de la liste des mods de tous les dossiers traités
+    if args.export:
+        with profiler.phase('export'):
+            ModsListExport(args.export, lang, args.export_file, export_stdout).export(list_done)
+
+    # Création du pdf (si argument nopause est false), uniquement pour un seul dossier de mods
+    if not list_instances and (args.nopause == 'false' or args.makepdf == 'true'):
+        make_pdf = None
         if args.makepdf == 'false':
-            input(f'{LanguageChoice().exiting_script}')
-    elif make_pdf == str(lang.no).lower() or make_pdf == str(
-            LanguageChoice().no[0]).lower():
-        print(f'{LanguageChoice().end_of_prg} ')
-        time.sleep(2)
-
-# On efface le dossier temp
-if Path('temp').is_dir():
-    shutil.rmtree('temp')
+            while make_pdf not in {str(lang.yes).lower(),
+                                   str(lang.yes[0]).lower(),
+                                   str(lang.no).lower(),
+                                   str(lang.no[0]).lower()}:
+                make_pdf = Prompt.ask(f'{lang.makepdf}',
+                                      choices=[lang.list_yesno[0],
+                                               lang.list_yesno[1],
+                                               lang.list_yesno[2],
+                                               lang.list_yesno[3]])
+        else:
+            make_pdf = str(lang.yes).lower()
+        if make_pdf == str(lang.yes).lower() or make_pdf == str(
+                lang.yes[0]).lower():
+            # Construction du titre
+            asterisk = '*'
+            nb_asterisk = len(lang.makePDFTitle) + 4
+            string_asterisk = asterisk * nb_asterisk
+            print(f'\t[green]{string_asterisk}[/green]')
+            print(f'\t[green]* {lang.makePDFTitle} *[/green]')
+            print(f'\t[green]{string_asterisk}[/green]')
+
+            print('\n')
+            # Infos déjà lues pendant la maj réutilisées (index des modinfo, réponses de l'API en cache)
+            with profiler.phase('pdf_list', path_mods):
+                table_data = ModsListBuilder(inst if inst is not None else VSUpdate(path_mods, lang)).build()
+
+            zip_validation.save()
+            with profiler.phase('pdf', path_mods):
+                pdf = MakePdf(table_data, lang)  # Données passées directement à MakePdf
+                pdf.makepdf()
+
+            if args.makepdf == 'false':
+                input(f'{lang.exiting_script}')
+        elif make_pdf == str(lang.no).lower() or make_pdf == str(
+                lang.no[0]).lower():
+            print(f'{lang.end_of_prg} ')
+            time.sleep(2)
+
+    # On efface le dossier temp
+    if Path('temp').is_dir():
+        shutil.rmtree('temp')
+
+    # Rapport des mesures (--profile)
+    profiler.report()
@@ -0,0 +1,94 @@
+# Micro-benchmark : lecture de modinfo.json par parse_modinfo et par l'ancienne suite de regex.
+# Usage : python benchmarks/bench_modinfo.py [dossier de mods] [--number N]
+# Sans dossier, un petit corpus de fichiers modinfo.json représentatifs est utilisé.
+import argparse
+import re
+import sys
+import timeit
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from VS_ModsUpdater import parse_modinfo  # noqa: E402
+
+SAMPLES = [
+    # Format habituel (indenté, clés avec majuscules)
+    '{\n  "type": "code",\n  "modid": "carrycapacity",\n  "name": "Carry Capacity",\n  "authors": ["copygirl"],\n'
+    '  "description": "Adds the capability to carry various things",\n  "version": "0.6.4",\n'
+    '  "dependencies": {\n    "game": "1.18.0"\n  }\n}',
+    '{\n\t"Type": "Code",\n\t"ModID": "primitivesurvival",\n\t"Name": "Primitive Survival",\n\t"Version": "3.2.6",\n'
+    '\t"Description": "Fishing, trapping and much more",\n\t"Side": "Universal",\n'
+    '\t"Dependencies": {\n\t\t"game": "1.19.0",\n\t\t"survival": ""\n\t}\n}',
+    # Sur une seule ligne (les regex capturent jusqu'à la fin de la ligne)
+    '{"type":"content","modid":"betterruins","name":"Better Ruins","version":"0.3.9","description":"More ruins",'
+    '"dependencies":{"game":"1.19.3"}}',
+    # Dialecte JSON5 : clés sans guillemets, commentaires, virgules finales
+    '{\n  type: "code",\n  // identifiant du mod\n  modid: "xlib",\n  name: "XLib",\n  version: "0.7.4",\n'
+    '  /* description\n     sur plusieurs lignes */\n  description: "Library mod",\n'
+    '  dependencies: { game: "1.19.0", },\n}',
+]
+
+
+def regex_modinfo(modinfo_content):
+    # Ancienne méthode d'extract_modinfo (4 recherches sur tout le fichier)
+    result_name = re.search(r'"{0,1}name"{0,1} {0,}: {0,}"(.*)",{0,}', modinfo_content, flags=re.IGNORECASE)
+    result_modid = re.search(r'"{0,1}modid"{0,1} {0,}: {0,}"(.*)",{0,}', modinfo_content, flags=re.IGNORECASE)
+    result_version = re.search(r'"{0,1}version"{0,1} {0,}: {0,}"(.*)",{0,}', modinfo_content, flags=re.IGNORECASE)
+    result_description = re.search(r'"{0,1}description"{0,1} {0,}: {0,}"(.*)",{0,}', modinfo_content,
+                                   flags=re.IGNORECASE)
+    return [result.group(1) if result else None
+            for result in (result_name, result_modid, result_version, result_description)]
+
+
+def parser_modinfo(modinfo_content):
+    modinfo_data = parse_modinfo(modinfo_content)
+    return [modinfo_data.get(key) for key in ('name', 'modid', 'version', 'description')]
+
+
+def load_corpus(mods_path):
+    corpus = []
+    for elem in sorted(Path(mods_path).glob('*.zip')):
+        try:
+            with zipfile.ZipFile(elem) as zip_file:
+                corpus.append(zip_file.read('modinfo.json').decode('utf-8-sig'))
+        except (zipfile.BadZipFile, KeyError, OSError, UnicodeDecodeError):
+            continue
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('modspath', nargs='?', help='Folder of mods used as corpus')
+    parser.add_argument('--number', type=int, default=200, help='Number of passes over the corpus')
+    bench_args = parser.parse_args()
+    corpus = load_corpus(bench_args.modspath) if bench_args.modspath else SAMPLES
+    if not corpus:
+        sys.exit('No modinfo.json found')
+
+    results = {}
+    for label, func in (('regex', regex_modinfo), ('parse_modinfo', parser_modinfo)):
+        def run_corpus(func=func):
+            for modinfo_content in corpus:
+                try:
+                    func(modinfo_content)
+                except ValueError:
+                    pass
+        elapsed = min(timeit.repeat(run_corpus, number=bench_args.number, repeat=3))
+        results[label] = elapsed
+        print(f'{label:>14} : {elapsed / (bench_args.number * len(corpus)) * 1e6:8.2f} µs/file')
+    print(f'{len(corpus)} files, ratio regex/parse_modinfo : {results["regex"] / results["parse_modinfo"]:.2f}')
+
+    # Fichiers pour lesquels les deux méthodes ne donnent pas le même résultat
+    differences = 0
+    for modinfo_content in corpus:
+        try:
+            parsed = parser_modinfo(modinfo_content)
+        except ValueError as err:
+            parsed = f'error: {err}'
+        if regex_modinfo(modinfo_content) != parsed:
+            differences += 1
+    print(f'{differences} file(s) read differently (regex over-capture, unquoted keys...)')
+
+
+if __name__ == '__main__':
+    main()
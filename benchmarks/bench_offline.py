@@ -0,0 +1,301 @@
+# Benchmark hors ligne : exécutions complètes du script (analyse des archives, vérification sur moddb,
+# téléchargements, pdf) contre un serveur local qui imite moddb (/api/mod/{modid}, /api/mods, pages des mods,
+# fichiers du cdn), sur des dossiers de mods générés de 10, 100 et 1000 mods.
+# Chaque taille est exécutée deux fois : 'cold' (mods à mettre à jour, caches vides) puis 'warm' (rien à faire).
+# Usage : python benchmarks/bench_offline.py [--sizes 10 100 1000] [--outdated 0.3] [--latency 20]
+#                                            [--output results.json] [--compare baseline.json] [--tolerance 0.25]
+# Le résultat (json) peut être comparé à celui d'une version précédente : le code de sortie est 1 en cas de régression.
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = Path(ROOT, 'VS_ModsUpdater.py')
+
+
+def make_png(size=64, color=(90, 140, 60)):
+    # Petite icône png (une seule couleur), pour modicon.png
+    raw = b''.join(b'\x00' + bytes(color) * size for _ in range(size))
+
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b''))
+
+
+class ModDBStandIn:
+    # Serveur local qui répond comme moddb pour les mods générés
+    def __init__(self, latency=0.0, mod_size=32 * 1024):
+        self.latency = latency
+        self.mod_size = mod_size
+        self.api_status = None  # code d'erreur renvoyé par l'API (502...) pour simuler une panne de moddb
+        self.mods = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.icon = make_png()
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.server.daemon_threads = True
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_mod(self, num, versions):
+        # versions : de la plus récente à la plus ancienne
+        modid = f'benchmod{num:04d}'
+        releases = []
+        for num_release, version in enumerate(versions):
+            releases.append({
+                'releaseid': num * 100 + num_release, 'modidstr': modid, 'modversion': version,
+                'filename': f'{modid}_v{version}.zip',
+                'mainfile': f'{self.base_url}files/{modid}_v{version}.zip?dl={modid}_v{version}.zip',
+                'tags': ['v1.20.0', 'v1.19.8'], 'created': f'2024-01-{num_release + 1:02d} 10:00:00',
+                'changelog': f'<ul><li>Changes of {version}</li><li>Fixes</li></ul>'})
+        self.mods[modid] = {'modid': num, 'assetid': 10000 + num, 'name': f'Bench Mod {num}',
+                            'urlalias': modid if num % 2 else None, 'releases': releases}
+        return modid
+
+    def mod_zip(self, modid, version, num):
+        # Archive du mod : modinfo.json, icône pour un mod sur trois, données incompressibles
+        buffer = tempfile.SpooledTemporaryFile()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr('modinfo.json', json.dumps({
+                'type': 'code', 'modid': modid, 'name': f'Bench Mod {num}', 'version': version,
+                'description': f'Synthetic mod {num} for the offline benchmark',
+                'authors': ['bench'], 'dependencies': {'game': '1.19.0'}}, indent=2))
+            if num % 3 == 0:
+                zip_file.writestr('modicon.png', self.icon)
+            zip_file.writestr('assets/data.bin', random.Random(f'{modid}{version}').randbytes(self.mod_size))
+        buffer.seek(0)
+        return buffer.read()
+
+    def count(self, kind, nb_bytes):
+        with self.lock:
+            counter = self.counters.setdefault(kind, {'requests': 0, 'bytes': 0})
+            counter['requests'] += 1
+            counter['bytes'] += nb_bytes
+
+    def snapshot(self):
+        with self.lock:
+            return json.loads(json.dumps(self.counters))
+
+    def handler(self):
+        standin = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *log_args):
+                pass
+
+            def send(self, kind, code, body, content_type='application/json', headers=None):
+                standin.count(kind, len(body))
+                self.send_response(code)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if standin.latency:
+                    time.sleep(standin.latency)
+                path = self.path.split('?')[0]
+                match_api = re.match(r'/api/mod/([\w-]+)$', path)
+                match_file = re.match(r'/(?:cdn/+)?files/(\w+)_v([\w.-]+)\.zip$', path)
+                if standin.api_status and (match_api or path == '/api/mods'):
+                    return self.send('api', standin.api_status, b'<html>Bad Gateway</html>', 'text/html')
+                if match_api:
+                    mod = standin.mods.get(match_api.group(1).lower())
+                    if mod is None:
+                        return self.send('api', 404, b'{"statuscode":"404"}')
+                    body = json.dumps({'statuscode': '200', 'mod': mod}).encode()
+                    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                    if self.headers.get('If-None-Match') == etag:
+                        return self.send('api', 304, b'', headers={'ETag': etag})
+                    return self.send('api', 200, body, headers={'ETag': etag})
+                if path == '/api/mods':
+                    mods = [{'modid': mod['modid'], 'assetid': mod['assetid'], 'name': mod['name'],
+                             'modidstrs': [modid], 'urlalias': mod['urlalias'],
+                             'lastreleased': mod['releases'][0]['created']} for modid, mod in standin.mods.items()]
+                    return self.send('api_mods', 200, json.dumps({'statuscode': '200', 'mods': mods}).encode())
+                if match_file and match_file.group(1) in standin.mods:
+                    modid, version = match_file.groups()
+                    data = standin.mod_zip(modid, version, standin.mods[modid]['modid'])
+                    return self.send('download', 200, data, 'application/zip')
+                if path.startswith('/show/mod/') or path.startswith('/modsupdater'):
+                    page = ('<html><div class="changelogtext"><strong>v0.0.1</strong><ul><li>Changes</li></ul></div>'
+                            '<a class="downloadbutton" href="/files/modsupdater.zip">Download</a></html>')
+                    return self.send('page', 200, page.encode(), 'text/html')
+                return self.send('other', 404, b'{"statuscode":"404"}')
+
+        return Handler
+
+
+def make_workdir(standin, nb_mods, outdated, bulk):
+    # Dossier de travail du script (config.ini, lang, font, banner) et dossier de mods généré
+    workdir = Path(tempfile.mkdtemp(prefix=f'vsmu-bench-{nb_mods}-'))
+    shutil.copytree(Path(ROOT, 'lang'), Path(workdir, 'lang'))
+    if Path(ROOT, 'font').is_dir():
+        shutil.copytree(Path(ROOT, 'font'), Path(workdir, 'font'))
+    shutil.copy(Path(ROOT, 'banner.png'), workdir)
+    path_mods = Path(workdir, 'Mods')
+    path_mods.mkdir()
+    rnd = random.Random(nb_mods)
+    for num in range(nb_mods):
+        is_outdated = rnd.random() < outdated
+        versions = ['1.1.0', '1.0.0'] if is_outdated else ['1.0.0']
+        modid = standin.add_mod(num, versions)
+        with open(Path(path_mods, f'{modid}_v1.0.0.zip'), 'wb') as mod_file:
+            mod_file.write(standin.mod_zip(modid, '1.0.0', num))
+    config = (
+        '[ModsUpdater]\nforce_update = false\ndisable_mod_dev = false\n'
+        f'bulk_lookup = {"true" if bulk else "false"}\n\n'
+        f'[ModPath]\npath = {path_mods}\n\n'
+        '[Language]\nlanguage = en_US\n\n'
+        '[Game_Version_max]\nversion = 100.0.0\n\n'
+        f'[ModDB]\nurl = {standin.base_url}\ncdn_url = {standin.base_url}cdn/\n\n'
+        '[Mod_Exclusion]\nmod1 = \n')
+    Path(workdir, 'config.ini').write_text(config, encoding='utf-8')
+    return workdir
+
+
+def run_script(workdir, make_pdf):
+    # Exécution complète du script, rapport --profile lu dans logs/
+    for report_path in Path(workdir, 'logs').glob('profile-*.json'):
+        report_path.unlink()
+    command = [sys.executable, str(SCRIPT), '--nopause', 'true', '--profile', 'true',
+               '--makepdf', 'true' if make_pdf else 'false']
+    start = time.perf_counter()
+    env = dict(os.environ, COLUMNS='120', PYTHONIOENCODING='utf-8')
+    result = subprocess.run(command, cwd=workdir, capture_output=True, text=True, encoding='utf-8',
+                            errors='replace', env=env)
+    wall_time = time.perf_counter() - start
+    reports = sorted(Path(workdir, 'logs').glob('profile-*.json'))
+    report = json.loads(reports[-1].read_text(encoding='utf-8')) if reports else {}
+    phases = {}
+    for phase in report.get('phases', []):
+        phases[phase['phase']] = round(phases.get(phase['phase'], 0) + phase['time'], 4)
+    return {'wall_time': round(wall_time, 3), 'returncode': result.returncode,
+            'startup_time': report.get('startup_time'), 'phases': phases,
+            'error': result.stderr[-2000:] if result.returncode else None}
+
+
+def counters_delta(before, after):
+    delta = {}
+    for kind, counter in after.items():
+        previous = before.get(kind, {'requests': 0, 'bytes': 0})
+        delta[kind] = {'requests': counter['requests'] - previous['requests'],
+                       'bytes': counter['bytes'] - previous['bytes']}
+    return delta
+
+
+def compare(results, baseline, tolerance):
+    # Régressions : temps plus long que la référence (au-delà de la tolérance) ou plus de requêtes
+    reference = {(run['size'], run['run']): run for run in baseline['runs']}
+    regressions = []
+    for run in results['runs']:
+        previous = reference.get((run['size'], run['run']))
+        if previous is None:
+            continue
+        if run['wall_time'] > previous['wall_time'] * (1 + tolerance):
+            regressions.append(f'{run["size"]} mods ({run["run"]}) : {previous["wall_time"]} s -> {run["wall_time"]} s')
+        if run['requests'] > previous['requests']:
+            regressions.append(f'{run["size"]} mods ({run["run"]}) : {previous["requests"]} -> {run["requests"]} requests')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='Sizes of the mods folders')
+    parser.add_argument('--outdated', type=float, default=0.3, help='Share of mods with a newer release')
+    parser.add_argument('--latency', type=float, default=20, help='Latency of the local server in ms')
+    parser.add_argument('--mod-size', type=int, default=32, help='Size of the data of each mod in KB')
+    parser.add_argument('--bulk', action='store_true', help='Use the bulk lookup mode (bulk_lookup = true)')
+    parser.add_argument('--no-pdf', action='store_true', help='Do not build the pdf')
+    parser.add_argument('--output', help='JSON file of the results (default: standard output only)')
+    parser.add_argument('--compare', help='JSON results of a previous version')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Accepted slowdown against --compare')
+    parser.add_argument('--keep', action='store_true', help='Keep the working folders')
+    bench_args = parser.parse_args()
+
+    script_version = re.search(r'__version__ = "(.*)"', SCRIPT.read_text(encoding='utf-8'))[1]
+    make_pdf = not bench_args.no_pdf and Path(ROOT, 'font').is_dir()
+    if not make_pdf and not bench_args.no_pdf:
+        print('font folder not found : pdf skipped', file=sys.stderr)
+    results = {
+        'version': script_version,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'outdated': bench_args.outdated, 'latency_ms': bench_args.latency,
+                   'mod_size_kb': bench_args.mod_size, 'bulk': bench_args.bulk, 'pdf': make_pdf},
+        'runs': []
+    }
+    for nb_mods in bench_args.sizes:
+        standin = ModDBStandIn(bench_args.latency / 1000, bench_args.mod_size * 1024).start()
+        workdir = make_workdir(standin, nb_mods, bench_args.outdated, bench_args.bulk)
+        nb_outdated = sum(len(mod['releases']) > 1 for mod in standin.mods.values())
+        try:
+            for run_name in ('cold', 'warm'):
+                before = standin.snapshot()
+                run = run_script(workdir, make_pdf)
+                counters = counters_delta(before, standin.snapshot())
+                run.update({
+                    'size': nb_mods, 'run': run_name, 'outdated': nb_outdated if run_name == 'cold' else 0,
+                    'requests': sum(counter['requests'] for counter in counters.values()),
+                    'downloads': counters.get('download', {}).get('requests', 0),
+                    'bytes': sum(counter['bytes'] for counter in counters.values()),
+                    'server': counters
+                })
+                results['runs'].append(run)
+                phases = ' '.join(f'{name}={phase_time:.2f}' for name, phase_time in run['phases'].items())
+                print(f'{nb_mods:>5} mods {run_name:>4} : {run["wall_time"]:7.2f} s, {run["requests"]:5} requests, '
+                      f'{run["downloads"]:4} downloads ({phases})', file=sys.stderr)
+                if run['returncode']:
+                    print(run['error'], file=sys.stderr)
+        finally:
+            standin.stop()
+            if bench_args.keep:
+                print(f'Working folder : {workdir}', file=sys.stderr)
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    if bench_args.output:
+        Path(bench_args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    else:
+        print(json.dumps(results, indent=2))
+    if bench_args.compare:
+        regressions = compare(results, json.loads(Path(bench_args.compare).read_text(encoding='utf-8')),
+                              bench_args.tolerance)
+        for regression in regressions:
+            print(f'Regression : {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# Benchmark : temps de démarrage du script (imports mesurés par python -X importtime).
+# Usage : python benchmarks/bench_startup.py [--budget MS] [--top N] [--runs N]
+# Le code de sortie est 1 si le temps d'import dépasse le budget.
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def importtime(module='VS_ModsUpdater'):
+    # Temps d'import (µs) par module : {module: (self, cumulé, niveau)}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Niveau d'imbrication : 2 espaces par niveau
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def help_time():
+    # Lancement complet le plus court (analyse des arguments puis sortie)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'VS_ModsUpdater.py', '--help'], cwd=ROOT, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget', type=float, default=250, help='Import time budget in ms')
+    parser.add_argument('--top', type=int, default=10, help='Number of top-level imports shown')
+    parser.add_argument('--runs', type=int, default=5, help='Number of runs (median is kept)')
+    bench_args = parser.parse_args()
+
+    runs = [importtime() for _ in range(bench_args.runs)]
+    total_ms = statistics.median(run['VS_ModsUpdater'][1] for run in runs) / 1000
+    last_run = runs[-1]
+    # Modules chargés directement par le script (premier niveau d'imbrication de -X importtime)
+    print('Heaviest imports (cumulative, last run) :')
+    heaviest = sorted(((cumulative, name) for name, (_, cumulative, depth) in last_run.items()
+                       if depth == 1), reverse=True)
+    for cumulative, name in heaviest[:bench_args.top]:
+        print(f'{name:>30} : {cumulative / 1000:8.1f} ms')
+    for lazy_module in ('bs4', 'fpdf', 'PIL'):
+        state = 'imported at startup' if lazy_module in last_run else 'not imported (lazy)'
+        print(f'{lazy_module:>30} : {state}')
+    print(f'--help : {statistics.median(help_time() for _ in range(bench_args.runs)) * 1000:.1f} ms')
+    print(f'Import time : {total_ms:.1f} ms (budget : {bench_args.budget:.0f} ms)')
+    if total_ms > bench_args.budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
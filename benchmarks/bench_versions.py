@@ -0,0 +1,86 @@
+# Benchmark : tri et comparaison de versions de mods par version_key et par l'ancienne méthode (semver).
+# Usage : python benchmarks/bench_versions.py [--count N]
+import argparse
+import functools
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from VS_ModsUpdater import version_key  # noqa: E402
+
+try:
+    import semver
+except ImportError:
+    semver = None
+
+
+def make_versions(count):
+    # Versions telles qu'on les trouve sur moddb, y compris quelques formats non semver
+    rnd = random.Random(42)
+    suffixes = ['', '', '', '', '-rc.1', '-pre.2', '-dev.3', '-beta', 'beta3', '.1']
+    versions = []
+    for _ in range(count):
+        parts = [str(rnd.randint(0, 3)), str(rnd.randint(0, 25)), str(rnd.randint(0, 15))]
+        if rnd.random() < 0.05:
+            parts = parts[:2]  # '1.19'
+        prefix = 'v' if rnd.random() < 0.05 else ''
+        versions.append(prefix + '.'.join(parts) + rnd.choice(suffixes))
+    return versions
+
+
+def normalize_version(version):
+    # Ancienne normalisation de VSUpdate avant semver.compare
+    version_parts = version.split('.')
+    version_parts[-1] = str(int(version_parts[-1]))
+    return '.'.join(version_parts)
+
+
+def semver_compare(version1, version2):
+    try:
+        return semver.compare(normalize_version(version1), normalize_version(version2))
+    except Exception:
+        return 0  # l'ancienne méthode écrivait un traceback dans le log
+
+
+def version_key_sortable(version):
+    # Les versions illisibles sont placées en premier
+    key = version_key(version)
+    return (0,) if key is None else (1, key)
+
+
+def timed(label, func, nb_versions):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f'{label:>12} (sort) : {elapsed * 1000:9.1f} ms ({elapsed / nb_versions * 1e6:.2f} µs/version)')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=20000, help='Number of version strings')
+    bench_args = parser.parse_args()
+    versions = make_versions(bench_args.count)
+
+    version_key.cache_clear()
+    timed('version_key', lambda: sorted(versions, key=version_key_sortable), len(versions))
+    invalid = sum(version_key(version) is None for version in versions)
+    print(f'{invalid} version(s) not readable by version_key')
+
+    if semver is None:
+        print('semver is not installed: old method skipped')
+        return
+    timed('semver', lambda: sorted(versions, key=functools.cmp_to_key(semver_compare)), len(versions))
+    failures = 0
+    for version in versions:
+        try:
+            semver.Version.parse(normalize_version(version))
+        except Exception:
+            failures += 1
+    print(f'{failures} version(s) not readable by semver (traceback in the log with the old method)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# Rejeu d'une panne de moddb (réponses 502) contre le serveur local de bench_offline.py.
+# 1. Cache vide : le script va jusqu'au bout et tous les mods sont signalés comme non vérifiés (status error).
+# 2. Après une exécution normale, cache expiré (api_ttl = 0) : les mods à mettre à jour sont signalés
+#    d'après la dernière réponse connue (status stale) et rien n'est téléchargé.
+# Usage : python benchmarks/replay_outage.py [--size 10] [--status 502] [--keep]
+# Le code de sortie est 1 si l'un des deux cas échoue.
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from bench_offline import SCRIPT, ModDBStandIn, make_workdir
+
+
+def run_export(workdir):
+    # Exécution complète, liste des mods (jsonl) lue sur la sortie standard
+    command = [sys.executable, str(SCRIPT), '--nopause', 'true', '--export', 'jsonl', '--export-file', '-']
+    env = dict(os.environ, COLUMNS='120', PYTHONIOENCODING='utf-8')
+    result = subprocess.run(command, cwd=workdir, capture_output=True, text=True, encoding='utf-8',
+                            errors='replace', env=env)
+    records = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+    return result, {record['modid']: record for record in records}
+
+
+def check(label, condition, failures):
+    print(f'{"ok" if condition else "FAILED":>6} : {label}', file=sys.stderr)
+    if not condition:
+        failures.append(label)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=10, help='Size of the mods folder')
+    parser.add_argument('--status', type=int, default=502, help='HTTP status returned by the API during the outage')
+    parser.add_argument('--keep', action='store_true', help='Keep the working folder')
+    bench_args = parser.parse_args()
+
+    standin = ModDBStandIn().start()
+    workdir = make_workdir(standin, bench_args.size, 0.5, False)
+    outdated = {modid for modid, mod in standin.mods.items() if len(mod['releases']) > 1}
+    config_path = Path(workdir, 'config.ini')
+    config_path.write_text(config_path.read_text(encoding='utf-8') +
+                           '\n[Cache]\napi_ttl = 0\nmanifest_ttl = 0\n', encoding='utf-8')
+    failures = []
+    try:
+        # Panne, aucune réponse connue
+        standin.api_status = bench_args.status
+        result, records = run_export(workdir)
+        check(f'{bench_args.status} with an empty cache : run completed', result.returncode == 0, failures)
+        check('every mod reported as not checked',
+              len(records) == bench_args.size and all(record['status'] == 'error' for record in records.values()),
+              failures)
+        if result.returncode:
+            print(result.stderr[-2000:], file=sys.stderr)
+
+        # Exécution normale pour remplir le cache, puis remise des anciennes versions
+        standin.api_status = None
+        path_mods = Path(workdir, 'Mods')
+        old_files = {modid: Path(path_mods, f'{modid}_v1.0.0.zip').read_bytes() for modid in outdated}
+        run_export(workdir)
+        for modid, data in old_files.items():
+            Path(path_mods, f'{modid}_v1.1.0.zip').unlink(missing_ok=True)
+            Path(path_mods, f'{modid}_v1.0.0.zip').write_bytes(data)
+
+        # Panne, réponses en cache expirées
+        standin.api_status = bench_args.status
+        downloads = standin.snapshot().get('download', {}).get('requests', 0)
+        result, records = run_export(workdir)
+        check(f'{bench_args.status} with an expired cache : run completed', result.returncode == 0, failures)
+        check('outdated mods reported as stale',
+              {modid for modid, record in records.items() if record['status'] == 'stale'} >= outdated, failures)
+        check('nothing downloaded',
+              standin.snapshot().get('download', {}).get('requests', 0) == downloads, failures)
+    finally:
+        standin.stop()
+        if bench_args.keep:
+            print(f'Working folder : {workdir}', file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()